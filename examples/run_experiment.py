@@ -19,21 +19,34 @@ usage:
   python examples/run_experiment.py --quick
   python examples/run_experiment.py --case infliximab_crohns_2015
   python examples/run_experiment.py --conditions CP_CI DP_DI NP_NI
+  python examples/run_experiment.py --output outputs/experiments_1234 --resume
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Dict
 
-from langchain_openai import AzureChatOpenAI
 from dotenv import load_dotenv
 from src.sim.run_full_simulation import run_full_simulation
 from src.utils.audit_logger import AuditLogger
 from src.utils.environment import Environment
+from src.utils.llm_client import (
+    SDK_MAX_RETRIES,
+    RateLimitedLLM,
+    RetryingLLM,
+    StopAtJSONEndLLM,
+    aclose_http_clients,
+    create_azure_llm_pool,
+    create_vllm_llm,
+)
+from src.utils.llm_cache import CachedLLM, DiskResponseCache
+from src.utils.llm_invoke import DedupLLM
 from src.data.case_registry import get_case, list_cases
 from src.data.policies.infliximab_policies import InfliximabCrohnsPolicies
 
@@ -58,6 +71,14 @@ PAYOR_POLICY = InfliximabCrohnsPolicies.PAYOR_POLICIES["cigna_ip0660_2026"] # "u
 CONTEXT_MODE = "symmetric"
 
 
+def _llm_model_name():
+    """model behind the llm stack: the vLLM model, or the Azure deployment(s), comma-separated when pooled"""
+    if os.getenv("VLLM_ENDPOINT"):
+        return os.getenv("VLLM_MODEL")
+    names = [n.strip() for n in os.getenv("AZURE_OPENAI_DEPLOYMENT_NAMES", "").split(",") if n.strip()]
+    return ",".join(names) if names else os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+
+
 def run_single(case, case_id, condition, llms, output_dir):
     run_id = f"{case_id}_{condition}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
@@ -75,7 +96,7 @@ def run_single(case, case_id, condition, llms, output_dir):
     }
     environment_config = {
         "allow_synthesis": True,
-        "synthesis_model": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME") if llms.get("synthesis") else None,
+        "synthesis_model": _llm_model_name() if llms.get("synthesis") else None,
     }
 
     audit_logger = AuditLogger(
@@ -135,9 +156,12 @@ def run_single(case, case_id, condition, llms, output_dir):
         audit_file = output_dir / f"{run_id}_audit.json"
         audit_logger.save_json(str(audit_file))
 
+        # metrics file doubles as the resume checkpoint, so write it atomically
         metrics_file = output_dir / f"{run_id}_metrics.json"
-        with open(metrics_file, "w") as f:
+        tmp_file = metrics_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
             json.dump(metrics_with_context, f, indent=2)
+        os.replace(tmp_file, metrics_file)
 
         print("  completed")
         print(f"    phase2_turns={metrics['phase2_turns']} lines={metrics['total_lines_requested']} "
@@ -167,7 +191,48 @@ def run_single(case, case_id, condition, llms, output_dir):
         return {"run_id": run_id, "condition": condition, "success": False, "error": str(e)}
 
 
-def run_batch(case_ids=None, conditions=None, output_dir=None):
+def _completed_run(output_dir, case_id, condition):
+    """result from an earlier run's metrics checkpoint, or None if this condition still needs running"""
+    matches = sorted(output_dir.glob(f"{case_id}_{condition}_*_metrics.json"))
+    if not matches:
+        return None
+    metrics_file = matches[-1]
+    with open(metrics_file) as f:
+        saved = json.load(f)
+    # the checkpoint is metrics_with_context: split it back into run_single's result shape.
+    # context_mode is the only key FrictionMetrics lacks; the policy and environment
+    # fields are metrics fields too, so they stay in metrics as well
+    metrics = {k: v for k, v in saved.items() if k != "context_mode"}
+    return {
+        "run_id": metrics_file.name[: -len("_metrics.json")],
+        "condition": condition,
+        "config_name": CONFIGS[condition]["name"],
+        "success": True,
+        "resumed": True,
+        "metrics": metrics,
+        "context_mode": saved.get("context_mode"),
+        "provider_policy": saved.get("provider_policy"),
+        "payor_policy": saved.get("payor_policy"),
+        "environment_config": saved.get("environment_config"),
+    }
+
+
+async def arun_batch(case_ids=None, conditions=None, output_dir=None, dedup_llm_calls=False, resume=False,
+                     max_concurrency=1, cache_llm_responses=False, json_mode=False, max_llm_calls=None,
+                     llm_cache_path=None, stop_at_json_end=False, max_llm_attempts=6,
+                     max_output_tokens=None, cache_normalize_whitespace=False):
+    """
+    run every (case, condition) with up to max_concurrency runs in flight, across cases:
+    a slot freed by any run is taken by the next pending run of any case.
+
+    each run is LLM-wait bound, so overlapping runs gives a near-linear speedup
+    until the deployment's rate limit is reached. the simulation itself is
+    synchronous; runs execute on worker threads while the event loop schedules them.
+    """
+    if resume and output_dir is None:
+        # the default directory is new for every batch, so there would be nothing to resume from
+        raise ValueError("resume=True needs output_dir (the batch directory to resume)")
+
     load_dotenv()
 
     # only infliximab case for now
@@ -178,41 +243,129 @@ def run_batch(case_ids=None, conditions=None, output_dir=None):
 
     if output_dir is None:
         import random
-        output_dir = f"outputs/experiments_{random.randint(1000, 9999)}"
-
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
+        # claim a fresh directory: mkdir without exist_ok is atomic, so two batches started
+        # together (or one landing on an earlier batch's number) never share outputs
+        Path("outputs").mkdir(exist_ok=True)
+        while True:
+            output_path = Path(f"outputs/experiments_{random.randint(1000, 9999)}")
+            try:
+                output_path.mkdir()
+                break
+            except FileExistsError:
+                continue
+    else:
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    # RetryingLLM owns retries when enabled; the client's own would multiply its attempts
+    sdk_max_retries = 0 if max_llm_attempts > 1 else SDK_MAX_RETRIES
+    if os.getenv("VLLM_ENDPOINT"):
+        # self-hosted OpenAI-compatible server instead of Azure
+        llm = create_vllm_llm(json_mode=json_mode, max_tokens=max_output_tokens, max_retries=sdk_max_retries)
+        if stop_at_json_end:
+            llm = StopAtJSONEndLLM(llm)
+    else:
+        llm = create_azure_llm_pool(
+            json_mode=json_mode,
+            stop_at_json_end=stop_at_json_end,
+            max_tokens=max_output_tokens,
+            max_retries=sdk_max_retries,
+        )
+    if max_llm_calls:
+        # bound API calls in flight across all runs to stay under the deployment quota;
+        # inside the retry so a call sleeping through a backoff does not hold a slot
+        llm = RateLimitedLLM(llm, max_llm_calls)
+    if max_llm_attempts > 1:
+        # back off and retry 429s/timeouts instead of failing the whole run
+        llm = RetryingLLM(llm, max_attempts=max_llm_attempts)
+    if dedup_llm_calls:
+        # identical prompts in flight at the same time share one response
+        llm = DedupLLM(llm)
+    disk_cache = DiskResponseCache(llm_cache_path) if llm_cache_path else None
+    if cache_llm_responses or disk_cache is not None:
+        # repeated identical prompts reuse the stored response (makes re-runs deterministic);
+        # keyed by deployment and response format too, so a persisted cache never replays
+        # another model's output
+        deployment = _llm_model_name() or ""
+        llm = CachedLLM(
+            llm,
+            disk_cache,
+            namespace=f"{deployment}|json_mode={json_mode}|max_tokens={max_output_tokens}",
+            normalize_whitespace=cache_normalize_whitespace,
+        )
+    llms = {"main": llm, "synthesis": llm}
 
-    llm = AzureChatOpenAI(
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+    max_concurrency = max(1, int(max_concurrency))
+    sem = asyncio.Semaphore(max_concurrency)
+    # to_thread runs on the loop's default executor, whose size is tied to the CPU count;
+    # runs are I/O bound, so size it to the requested concurrency (+1 for case loading)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max_concurrency + 1, thread_name_prefix="sim-run")
     )
-    llms = {"main": llm, "synthesis": llm}
+
+    async def _one(case, case_id, cond):
+        if resume:
+            done = _completed_run(output_path, case_id, cond)
+            if done is not None:
+                print(f"  skipping: {done['run_id']} (already completed)")
+                return done
+        async with sem:
+            return await asyncio.to_thread(run_single, case, case_id, cond, llms, output_path)
 
     results = []
 
     all_case_ids = set(list_cases())
+    valid_case_ids = []
     for case_id in case_ids:
         if case_id not in all_case_ids:
             print(f"warning: {case_id} not found")
             continue
+        valid_case_ids.append(case_id)
 
-        case = get_case(case_id)
+    conditions = [cond for cond in conditions if cond in CONFIGS]
+
+    async def _case(case_id):
+        # case files load in the background while earlier runs wait on LLM I/O
+        case = await asyncio.to_thread(get_case, case_id)
         print(f"\ncase: {case_id}")
+        return await asyncio.gather(*(_one(case, case_id, cond) for cond in conditions))
 
-        for cond in conditions:
-            if cond not in CONFIGS:
-                continue
-            result = run_single(case, case_id, cond, llms, output_path)
-            results.append(result)
+    try:
+        for case_results in await asyncio.gather(*(_case(case_id) for case_id in valid_case_ids)):
+            results.extend(case_results)
+    finally:
+        # release pooled connections before asyncio.run tears down the loop
+        await aclose_http_clients()
+        if disk_cache is not None:
+            disk_cache.close()
 
     print(f"\nbatch complete: {len(results)} runs")
 
     return results
 
 
+def run_batch(case_ids=None, conditions=None, output_dir=None, dedup_llm_calls=False, resume=False,
+              max_concurrency=1, cache_llm_responses=False, json_mode=False, max_llm_calls=None,
+              llm_cache_path=None, stop_at_json_end=False, max_llm_attempts=6,
+              max_output_tokens=None, cache_normalize_whitespace=False):
+    return asyncio.run(arun_batch(
+        case_ids=case_ids,
+        conditions=conditions,
+        output_dir=output_dir,
+        dedup_llm_calls=dedup_llm_calls,
+        resume=resume,
+        max_concurrency=max_concurrency,
+        cache_llm_responses=cache_llm_responses,
+        json_mode=json_mode,
+        max_llm_calls=max_llm_calls,
+        llm_cache_path=llm_cache_path,
+        stop_at_json_end=stop_at_json_end,
+        max_llm_attempts=max_llm_attempts,
+        max_output_tokens=max_output_tokens,
+        cache_normalize_whitespace=cache_normalize_whitespace,
+    ))
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -221,10 +374,41 @@ if __name__ == "__main__":
     parser.add_argument("--case", type=str, default="infliximab_crohns_2015")
     parser.add_argument("--conditions", nargs="+")
     parser.add_argument("--output", default=None)
+    parser.add_argument("--dedup-llm-calls", action="store_true")
+    parser.add_argument("--resume", action="store_true", help="skip conditions that already have metrics in --output")
+    parser.add_argument("--max-concurrency", type=int, default=1, help="simulation runs in flight at once")
+    parser.add_argument("--cache-llm", action="store_true", help="reuse responses for identical prompts")
+    parser.add_argument("--llm-cache-path", default=None, help="sqlite file persisting the response cache across runs")
+    parser.add_argument("--json-mode", action="store_true", help="request JSON-object responses from the API")
+    parser.add_argument("--max-llm-calls", type=int, default=None, help="API calls in flight at once across all runs")
+    parser.add_argument("--stop-at-json-end", action="store_true",
+                        help="stream replies and stop reading once the JSON object closes")
+    parser.add_argument("--max-llm-attempts", type=int, default=6,
+                        help="tries per API call on 429s, timeouts and 5xx (1: only the openai client's own retries)")
+    parser.add_argument("--max-output-tokens", type=int, default=None,
+                        help="cap on tokens per LLM reply (default: no cap)")
+    parser.add_argument("--cache-normalize-whitespace", action="store_true",
+                        help="response cache treats prompts differing only in whitespace as identical")
 
     args = parser.parse_args()
+    if args.resume and not args.quick and args.output is None:
+        parser.error("--resume needs --output: without it every batch writes to a new directory")
 
     if args.quick:
-        run_batch(case_ids=[args.case], conditions=["CP_CI"], output_dir="outputs/sym_quick_test")
+        run_batch(case_ids=[args.case], conditions=["CP_CI"], output_dir="outputs/sym_quick_test",
+                  dedup_llm_calls=args.dedup_llm_calls, resume=args.resume,
+                  max_concurrency=args.max_concurrency, cache_llm_responses=args.cache_llm,
+                  json_mode=args.json_mode, max_llm_calls=args.max_llm_calls,
+                  llm_cache_path=args.llm_cache_path, stop_at_json_end=args.stop_at_json_end,
+                  max_llm_attempts=args.max_llm_attempts,
+                  max_output_tokens=args.max_output_tokens,
+                  cache_normalize_whitespace=args.cache_normalize_whitespace)
     else:
-        run_batch(case_ids=[args.case], conditions=args.conditions, output_dir=args.output)
+        run_batch(case_ids=[args.case], conditions=args.conditions, output_dir=args.output,
+                  dedup_llm_calls=args.dedup_llm_calls, resume=args.resume,
+                  max_concurrency=args.max_concurrency, cache_llm_responses=args.cache_llm,
+                  json_mode=args.json_mode, max_llm_calls=args.max_llm_calls,
+                  llm_cache_path=args.llm_cache_path, stop_at_json_end=args.stop_at_json_end,
+                  max_llm_attempts=args.max_llm_attempts,
+                  max_output_tokens=args.max_output_tokens,
+                  cache_normalize_whitespace=args.cache_normalize_whitespace)
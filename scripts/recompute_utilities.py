@@ -20,12 +20,7 @@ from pathlib import Path
 ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT))
 
-from src.data.pricing.cms_rates import (
-    lookup_rate, UnknownProcedureCodeError,
-    ADMIN_COST_PROVIDER_L0, ADMIN_COST_INSURER_L0,
-    ADMIN_COST_PROVIDER_L12, ADMIN_COST_INSURER_L12,
-    IRE_CASE_COST, PROMPT_PAY_RATE, REVIEW_DELAY_DAYS,
-)
+from src.data.pricing.cms_rates import lookup_rate, UnknownProcedureCodeError, compute_utilities
 
 ASYM_DIR = ROOT / "outputs" / "asym_experiments_1333"
 SYM_DIR  = ROOT / "outputs" / "experiments_4587"
@@ -111,10 +106,6 @@ def recompute(audit_path: Path, info_condition: str, condition: str) -> dict:
         deficit = phase2_turns - sum(level_counts.values())
         level_counts[0] = level_counts.get(0, 0) + deficit
 
-    # admin costs: level-differentiated
-    admin_p = (n_l0 + phase3_turns) * ADMIN_COST_PROVIDER_L0 + n_l12 * ADMIN_COST_PROVIDER_L12
-    admin_i = (n_l0 + phase3_turns) * ADMIN_COST_INSURER_L0  + n_l12 * ADMIN_COST_INSURER_L12
-
     # recompute service values using corrected rates (ignore stored rate in line_pricing)
     # for paid lines: use approved_quantity from audit (handles modified lines correctly)
     R_P = 0.0
@@ -148,17 +139,11 @@ def recompute(audit_path: Path, info_condition: str, condition: str) -> dict:
             "old_rate": lp.get("rate"),
         })
 
-    # IRE reversal costs: F_IRE + prompt-pay interest when L2 reached and overturn occurred
-    ire_cost = 0.0
-    interest = 0.0
-    if max_level >= 2:
-        ire_cost += IRE_CASE_COST
-        if R_P > 0:
-            interest = PROMPT_PAY_RATE * R_P * REVIEW_DELAY_DAYS / 365
-            ire_cost += interest
-
-    U_P = R_P - admin_p
-    U_I = S_I - R_P - admin_i - ire_cost
+    # admin costs (level-differentiated) + IRE reversal costs, same math as phase 4
+    u = compute_utilities(
+        n_l0=n_l0, n_l12=n_l12, n_phase3=phase3_turns, max_level=max_level,
+        service_value=S_I, reimbursement=R_P,
+    )
 
     return {
         "condition": condition,
@@ -168,14 +153,14 @@ def recompute(audit_path: Path, info_condition: str, condition: str) -> dict:
         "level_counts": level_counts,
         "n_l0": n_l0, "n_l12": n_l12,
         "phase3_turns": phase3_turns,
-        "admin_p": round(admin_p, 2),
-        "admin_i": round(admin_i, 2),
-        "ire_cost": round(ire_cost, 2),
-        "interest": round(interest, 2),
+        "admin_p": round(u.admin_provider, 2),
+        "admin_i": round(u.admin_insurer, 2),
+        "ire_cost": round(u.ire_cost, 2),
+        "interest": round(u.interest, 2),
         "S_I": round(S_I, 2),
         "R_P": round(R_P, 2),
-        "U_P": round(U_P, 2),
-        "U_I": round(U_I, 2),
+        "U_P": round(u.provider_utility, 2),
+        "U_I": round(u.insurer_utility, 2),
         "repriced_lines": repriced,
         "unpriced": unpriced,
     }
@@ -17,6 +17,7 @@ run verify_against_appendix() to cross-check against paper appendix.
 """
 
 from __future__ import annotations
+from functools import lru_cache
 from typing import Dict, List, NamedTuple, Optional, Tuple
 
 
@@ -67,6 +68,8 @@ IRE_CASE_COST: float = 650.00
 # prompt-payment interest: Bureau of Fiscal Service H1 2026, applied under 42 CFR 422.520
 PROMPT_PAY_RATE: float = 0.04125
 REVIEW_DELAY_DAYS: int = 67  # 7 (L0) + 30 (L1) + 30 (L2), per CMS-4208-F effective 2026-01-01
+# interest owed per dollar reimbursed after the full L0-L2 review delay
+PROMPT_PAY_INTEREST_FACTOR: float = PROMPT_PAY_RATE * REVIEW_DELAY_DAYS / 365
 
 # kept for backward compatibility — equals L0 electronic rate
 ADMIN_COST_PROVIDER_PER_TURN: float = ADMIN_COST_PROVIDER_L0
@@ -104,8 +107,14 @@ def verify_against_appendix() -> List[str]:
     return errors
 
 
+@lru_cache(maxsize=4096)
 def check_code_match(procedure_code: str, llm_service_name: str) -> Tuple[bool, str]:
-    """returns (is_consistent, warning) by checking keywords against LLM service_name"""
+    """
+    returns (is_consistent, warning) by checking keywords against LLM service_name
+
+    memoized: the same (code, name) pairs recur across turns and runs, and the
+    keyword scan and warning text depend on nothing else.
+    """
     if not procedure_code or not llm_service_name:
         return True, ""
     code = str(procedure_code).strip().upper()
@@ -141,13 +150,69 @@ def lookup_rate(procedure_code: str) -> float:
     return rate
 
 
-def get_description(procedure_code: str) -> Optional[str]:
+def get_code_info(procedure_code: str) -> Optional[CodeInfo]:
+    """rate + description + keywords in one normalized lookup; None for empty/unknown codes"""
     if not procedure_code:
         return None
-    info = _ALL_CODES.get(str(procedure_code).strip().upper())
+    return _ALL_CODES.get(str(procedure_code).strip().upper())
+
+
+def get_description(procedure_code: str) -> Optional[str]:
+    info = get_code_info(procedure_code)
     return info.description if info else None
 
 
+class UtilityBreakdown(NamedTuple):
+    admin_provider: float
+    admin_insurer: float
+    ire_cost: float
+    interest: float
+    provider_utility: float
+    insurer_utility: float
+
+
+def compute_utilities(
+    *,
+    n_l0: int,
+    n_l12: int,
+    n_phase3: int,
+    max_level: int,
+    service_value: float,
+    reimbursement: float,
+) -> UtilityBreakdown:
+    """
+    deterministic payoff math shared by phase 4 and offline recomputation (unrounded)
+
+    admin: L0 + phase 3 turns at electronic rate, L1-2 turns at manual rate (CAQH 2023)
+    IRE: F_IRE once L2 is reached, plus prompt-pay interest if the insurer ends up paying
+    utilities use alpha=1 (admin costs weighted equally to financial outcomes)
+    """
+    n_electronic = n_l0 + n_phase3
+    admin_p = n_electronic * ADMIN_COST_PROVIDER_L0 + n_l12 * ADMIN_COST_PROVIDER_L12
+    admin_i = n_electronic * ADMIN_COST_INSURER_L0 + n_l12 * ADMIN_COST_INSURER_L12
+
+    # branchless: bools multiply as 0/1, so both terms vanish below L2 (and interest
+    # with nothing paid), keeping this straight-line arithmetic for batch callers
+    reached_ire = max_level >= 2
+    interest = reimbursement * PROMPT_PAY_INTEREST_FACTOR * (reached_ire and reimbursement > 0)
+    ire_cost = IRE_CASE_COST * reached_ire + interest
+
+    # positional, in field order: skips NamedTuple keyword matching
+    return UtilityBreakdown(
+        admin_p,
+        admin_i,
+        ire_cost,
+        interest,
+        reimbursement - admin_p,
+        service_value - reimbursement - admin_i - ire_cost,
+    )
+
+
+def to_cents(amount: float) -> int:
+    """dollar amount -> integer cents (all table rates are whole cents)"""
+    return round(amount * 100)
+
+
 def line_value(procedure_code: str, quantity: int) -> float:
     """raises on unknown code or bad quantity"""
     rate = lookup_rate(procedure_code)
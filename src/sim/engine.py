@@ -5,8 +5,9 @@ from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from src.sim.adapter_base import SimAdapter, Delta
 from src.utils.audit_events import make_event
+from src.sim.transitions import _normalize_status
 from src.utils.audit_logger import AuditLogger
-from src.utils.prompts.config import MAX_TURNS_SAFETY_LIMIT
+from src.utils.prompts.config import MAX_TURNS_SAFETY_LIMIT, STALL_TURN_LIMIT
 
 
 def _delta_to_event(state, delta: Delta):
@@ -15,6 +16,26 @@ def _delta_to_event(state, delta: Delta):
     return make_event(phase=state.phase, turn=state.turn, kind=kind, payload=d)
 
 
+def _decision_signature(response: Dict[str, Any], provider_action: Dict[str, Any]):
+    """
+    closed-vocabulary content of one exchange, for stall detection
+
+    per-line insurer statuses plus the provider's action type and line targets. free
+    text (decision reasons, provider reasoning) is left out, so a turn that only
+    rewords the previous one still counts as a repeat.
+    """
+    pay = response.get("payor_response") or {}
+    statuses = frozenset(
+        (str(adj.get("line_number")), _normalize_status(str(adj.get("authorization_status", adj.get("adjudication_status")))))
+        for adj in pay.get("line_adjudications") or []
+    )
+    line_actions = frozenset(
+        (str(la.get("line_number")), str(la.get("action")).upper(), str(la.get("to_level")), str(la.get("mode")).upper())
+        for la in provider_action.get("line_actions") or []
+    )
+    return statuses, str(provider_action.get("action")).upper(), line_actions
+
+
 def run(
     *,
     state,
@@ -27,6 +48,10 @@ def run(
     if audit_logger is not None:
         audit_logger.log(phase=state.phase, turn=state.turn, kind="phase_start", payload={})
 
+    # turns in a row where the insurer and provider repeated the previous turn's decisions
+    stalled_turns = 0
+    prev_exchange = None
+
     t = 0
     while t < MAX_TURNS_SAFETY_LIMIT:
         state.turn = t
@@ -59,6 +84,7 @@ def run(
             break
 
         provider_action = adapter.choose_provider_action(state, submission, response)
+        exchange = _decision_signature(response, provider_action)
 
         # Store provider_action in the response for history tracking
         response["provider_action"] = provider_action
@@ -77,6 +103,14 @@ def run(
                 audit_logger.log(phase=state.phase, turn=state.turn, kind="phase_terminated", payload={"reason": term_reason})
             break
 
+        if STALL_TURN_LIMIT:
+            stalled_turns = stalled_turns + 1 if exchange == prev_exchange else 0
+            prev_exchange = exchange
+            if stalled_turns >= STALL_TURN_LIMIT:
+                if audit_logger is not None:
+                    audit_logger.log(phase=state.phase, turn=state.turn, kind="phase_terminated", payload={"reason": "stalled"})
+                break
+
         t += 1
 
     if audit_logger is not None:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from typing import Any, Dict, List
 
 from src.models.financial import ServiceLineRequest
@@ -101,9 +102,12 @@ def ensure_phase2_service_lines(state, insurer_request: Dict[str, Any]) -> None:
             if k not in svc:
                 raise ValueError(f"requested_services missing {k}: {svc}")
 
+        # closed-vocabulary fields are interned: lines keep them for the whole run and they
+        # recur across turns, lines and concurrent runs, so equal values share one object.
+        # free text (service_name, rationales) is not: interned strings are never freed
         rt = str(svc["request_type"]).strip()
-        code = str(svc["procedure_code"]).strip()
-        ct = _normalize_code_type(svc["code_type"])
+        code = sys.intern(str(svc["procedure_code"]).strip())
+        ct = sys.intern(_normalize_code_type(svc["code_type"]))
         name = str(svc["service_name"]).strip()
 
         rationale = ""
@@ -118,6 +122,8 @@ def ensure_phase2_service_lines(state, insurer_request: Dict[str, Any]) -> None:
             rationale = str(svc.get("severity_indicators") or "")
         else:
             raise ValueError(f"bad request_type: {rt}")
+        # validated above, so only the known request types are interned
+        rt = sys.intern(rt)
 
         line = ServiceLineRequest(
             line_number=int(svc["line_number"]),
@@ -3,8 +3,6 @@ Only load the actualy case in run script, this is just phase 1 logic for any cas
 """
 from __future__ import annotations
 
-from copy import deepcopy
-from datetime import datetime
 from typing import Any, Dict, Optional
 
 from src.models.patient import PatientVisibleData
@@ -51,15 +49,23 @@ def run_phase1(
     # Pydantic will enforce type constraints (e.g., sex in {"M","F"}).
     pvd_model = PatientVisibleData(**raw_pvd)
 
+    # the case dict is shared by every run of the case (concurrent conditions included), so
+    # the state gets its own containers for whatever a run may write: the top level and the
+    # diagnostic results map. everything else in the hidden data is only read, and shared.
+    hidden = dict(case["environment_hidden_data"])
+    results_by_code = hidden.get("diagnostic_results_by_code")
+    if isinstance(results_by_code, dict):
+        hidden["diagnostic_results_by_code"] = dict(results_by_code)
+
+    # only fall back to the date-stamped default id when the caller didn't supply one
+    ident: Dict[str, Any] = {} if encounter_id is None else {"encounter_id": encounter_id}
     state = EncounterState(
         case_id=case["case_id"],
         case_type=case["case_type"],
         patient_visible_data=pvd_model,
-        environment_hidden_data=deepcopy(case["environment_hidden_data"]),
+        environment_hidden_data=hidden,
+        **ident,
         #everything else defaults
     )
 
-    if encounter_id is not None:
-        state.encounter_id = encounter_id
-
     return state
\ No newline at end of file
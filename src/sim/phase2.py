@@ -27,11 +27,8 @@ def run_phase2(
             allow_synthesis=True,
             audit_logger=audit_logger,
         )
-    else:
-        if getattr(environment, "audit_logger", None) is None:
-            environment.audit_logger = audit_logger
-        if getattr(environment, "allow_synthesis", False) and getattr(environment, "synthesis_llm", None) is None:
-            environment.synthesis_llm = provider_llm
+    elif getattr(environment, "allow_synthesis", False) and getattr(environment, "synthesis_llm", None) is None:
+        environment.synthesis_llm = provider_llm
 
     adapter = Phase2Adapter(
         provider_llm=provider_llm,
@@ -1,24 +1,48 @@
 from __future__ import annotations
 
+import json
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage
-from langchain_core.messages.system import SystemMessage
-
 from src.utils.prompts.phase2_prompts import (
     create_phase2_payor_system_prompt,
     create_phase2_payor_user_prompt,
     create_phase2_provider_system_prompt,
     create_phase2_provider_user_prompt,
-    create_phase2_provider_action_prompt,
+    render_phase2_prior_round,
 )
 from src.sim.line_items import ensure_phase2_service_lines
-from src.sim.transitions import apply_phase2_insurer_line_adjudications, apply_phase2_provider_bundle_action
+from src.sim.transitions import (
+    _all_lines_terminal_phase2,
+    apply_phase2_insurer_line_adjudications,
+    apply_phase2_provider_bundle_action,
+)
+from src.data.policies.infliximab_policies import InfliximabCrohnsPolicies
 from src.utils.json_parsing import extract_json_from_text
+from src.utils.llm_invoke import invoke_text
+from src.utils.prompts.config import PROVIDER_STRATEGY_GUIDANCE
+from src.utils.prompts.schema_definitions import PROVIDER_ACTION_SCHEMA, PROVIDER_ACTION_JSON
 
 Delta = Dict[str, Any]
 
 
+def _action_system_prompt(guidance: str) -> str:
+    strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
+    return (
+        "PHASE 2 PROVIDER ACTION DECISION\n"
+        "You are a hospital provider team deciding how to respond to the insurer's authorization decision.\n"
+        f"{strategy_block}"
+        f"{PROVIDER_ACTION_SCHEMA}\n"
+        "Respond only with valid JSON matching the schema."
+    )
+
+
+# static per strategy: built once so every call sends a byte-identical prefix (provider-side prompt caching)
+_ACTION_SYSTEM_PROMPTS: Dict[str, str] = {
+    strategy: _action_system_prompt(guidance) for strategy, guidance in PROVIDER_STRATEGY_GUIDANCE.items()
+}
+
+
 def _provider_params(state, adapter_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if adapter_params is not None:
         return adapter_params
@@ -41,11 +65,6 @@ def _payor_params(state, adapter_params: Optional[Dict[str, Any]]) -> Dict[str,
     return sp
 
 
-def _invoke(llm, system_text: str, user_text: str) -> str:
-    resp = llm.invoke([SystemMessage(content=system_text), HumanMessage(content=user_text)])
-    return resp.content
-
-
 def _parse_obj(text: str) -> Dict[str, Any]:
     obj = extract_json_from_text(text)
     if not isinstance(obj, dict):
@@ -185,7 +204,7 @@ def _payor_encounter_history(state) -> List[Dict[str, Any]]:
     return history
 
 
-def _prior_round_summaries(state) -> List[Dict[str, Any]]:
+def _prior_round_summaries(state, start: int = 0) -> List[Dict[str, Any]]:
     """
     Build detailed summaries of prior rounds for provider LLM context.
     Includes service line details so provider remembers what was requested and why it was denied/pended.
@@ -194,7 +213,7 @@ def _prior_round_summaries(state) -> List[Dict[str, Any]]:
     submissions = state.phase2_submissions if state.phase2_submissions is not None else []
     responses = state.phase2_responses if state.phase2_responses is not None else []
 
-    for sub, resp in zip(submissions, responses):
+    for sub, resp in zip(submissions[start:], responses[start:]):
         if not isinstance(sub, dict):
             raise ValueError(f"phase2_submissions entry must be dict, got {type(sub)}")
         if not isinstance(resp, dict):
@@ -271,6 +290,12 @@ def _prior_round_summaries(state) -> List[Dict[str, Any]]:
 class Phase2Adapter:
     phase_name = "phase_2_utilization_review"
 
+    # attributes are read on every turn; slots make those fixed-offset loads
+    __slots__ = (
+        "provider_llm", "payor_llm", "provider_params", "payor_params", "environment", "audit_logger",
+        "_provider_system_prompt", "_prior_rounds_rendered", "_payor_system_prompts",
+    )
+
     def __init__(
         self,
         *,
@@ -288,14 +313,15 @@ class Phase2Adapter:
         self.environment = environment
         self.audit_logger = audit_logger
 
-        if self.environment is not None and getattr(self.environment, "audit_logger", None) is None:
-            try:
-                self.environment.audit_logger = audit_logger
-            except Exception:
-                pass
+        # system prompts depend only on params (and review level for the payor), which are fixed
+        # for the life of the adapter: build each once instead of on every turn
+        # interned so concurrent runs with the same params share one copy in their audit logs
+        self._provider_system_prompt: Optional[str] = None
+        self._payor_system_prompts: Dict[int, str] = {}
+        # rendered PRIOR HISTORY rounds, extended as the phase progresses
+        self._prior_rounds_rendered: List[str] = []
 
     def is_terminal(self, state) -> bool:
-        from src.sim.transitions import _all_lines_terminal_phase2
         return _all_lines_terminal_phase2(state)
 
     def append_submission(self, state, submission: Dict[str, Any]) -> None:
@@ -310,15 +336,21 @@ class Phase2Adapter:
 
     def build_submission(self, state) -> Dict[str, Any]:
         level = _current_level(state)
-        prior_rounds = _prior_round_summaries(state)
-
-        params = _provider_params(state, self.provider_params)
-        sys_txt = create_phase2_provider_system_prompt(params)
+        # submission/response history is append-only, so only rounds completed since
+        # the last turn are summarized and rendered; earlier rounds reuse their text
+        rendered = self._prior_rounds_rendered
+        for r in _prior_round_summaries(state, start=len(rendered)):
+            rendered.append(render_phase2_prior_round(len(rendered), r))
+
+        if self._provider_system_prompt is None:
+            params = _provider_params(state, self.provider_params)
+            self._provider_system_prompt = sys.intern(create_phase2_provider_system_prompt(params))
+        sys_txt = self._provider_system_prompt
         user_txt = create_phase2_provider_user_prompt(
-            state, turn=state.turn, level=level, prior_rounds=prior_rounds
+            state, turn=state.turn, level=level, prior_rounds_rendered=rendered
         )
 
-        draft = _invoke(self.provider_llm, sys_txt, user_txt)
+        draft = invoke_text(self.provider_llm, sys_txt, user_txt)
         parsed = _parse_obj(draft)
 
         insurer_req = parsed.get("insurer_request")
@@ -352,29 +384,30 @@ class Phase2Adapter:
         }
 
     def build_response(self, state, submission: Dict[str, Any]) -> Dict[str, Any]:
-        from src.data.policies.infliximab_policies import InfliximabCrohnsPolicies
-
         insurer_req = submission["insurer_request"]
         level = int(submission.get("level", 0))
         pend_count = _pend_count_at_level(state, level)
         encounter_history = _payor_encounter_history(state)
 
-        params = dict(_payor_params(state, self.payor_params))
-        if level >= 2:
-            # IRE uses Medicare LCD, not insurer's proprietary policy
-            params["policy"] = InfliximabCrohnsPolicies.PAYOR_POLICIES["cms_lcd_l35677"]
-            # suppress strategy (IRE is objective)
-            params["strategy"] = "default"
-            # suppress clinical guideline (IRE evaluates against LCD only)
-            params.pop("clinical_guideline", None)
+        sys_txt = self._payor_system_prompts.get(level)
+        if sys_txt is None:
+            params = dict(_payor_params(state, self.payor_params))
+            if level >= 2:
+                # IRE uses Medicare LCD, not insurer's proprietary policy
+                params["policy"] = InfliximabCrohnsPolicies.PAYOR_POLICIES["cms_lcd_l35677"]
+                # suppress strategy (IRE is objective)
+                params["strategy"] = "default"
+                # suppress clinical guideline (IRE evaluates against LCD only)
+                params.pop("clinical_guideline", None)
+            sys_txt = sys.intern(create_phase2_payor_system_prompt(params, level=level))
+            self._payor_system_prompts[level] = sys_txt
 
-        sys_txt = create_phase2_payor_system_prompt(params, level=level)
         user_txt = create_phase2_payor_user_prompt(
             state, insurer_req, turn=state.turn, level=level,
             pend_count_at_level=pend_count, encounter_history=encounter_history
         )
 
-        draft = _invoke(self.payor_llm, sys_txt, user_txt)
+        draft = invoke_text(self.payor_llm, sys_txt, user_txt)
         parsed = _parse_obj(draft)
 
         if not isinstance(parsed.get("line_adjudications"), list):
@@ -441,7 +474,7 @@ class Phase2Adapter:
 
         if self.environment is not None:
             try:
-                deltas.extend(self.environment.perform_approved_diagnostics(state=state))
+                deltas.extend(self.environment.perform_approved_diagnostics(state=state, audit_logger=self.audit_logger))
             except Exception as e:
                 if self.audit_logger is not None:
                     try:
@@ -464,8 +497,6 @@ class Phase2Adapter:
         Provider sees payor response and decides per-line actions or RESUBMIT.
         Note: _submission and _response kept for API compatibility.
         """
-        from src.utils.prompts.schema_definitions import PROVIDER_ACTION_SCHEMA, PROVIDER_ACTION_JSON
-
         lines = state.service_lines
         if lines is None:
             raise ValueError("state.service_lines is None")
@@ -509,19 +540,8 @@ class Phase2Adapter:
             })
 
         params = _provider_params(state, self.provider_params)
-        from src.utils.prompts.config import PROVIDER_STRATEGY_GUIDANCE
-        guidance = PROVIDER_STRATEGY_GUIDANCE[params["strategy"]]
-        strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
-
-        system_prompt = (
-            "PHASE 2 PROVIDER ACTION DECISION\n"
-            "You are a hospital provider team deciding how to respond to the insurer's authorization decision.\n"
-            f"{strategy_block}"
-            f"{PROVIDER_ACTION_SCHEMA}\n"
-            "Respond only with valid JSON matching the schema."
-        )
+        system_prompt = _ACTION_SYSTEM_PROMPTS[params["strategy"]]
 
-        import json
         user_prompt = (
             f"Current Review Level: {level}\n"
             f"Max Appeal Level: 2 (IRE - final)\n\n"
@@ -541,7 +561,7 @@ class Phase2Adapter:
             f"Return only valid JSON:\n{PROVIDER_ACTION_JSON}"
         )
 
-        raw = _invoke(self.provider_llm, system_prompt, user_prompt)
+        raw = invoke_text(self.provider_llm, system_prompt, user_prompt)
         parsed = _parse_obj(raw)
 
         if self.audit_logger:
@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional
 from src.models.state import EncounterState
 from src.sim.engine import run as run_engine
 from src.sim.phase3_adapter import Phase3Adapter
+from src.sim.transitions import _is_line_deliverable
 from src.utils.audit_logger import AuditLogger
 
 
@@ -22,12 +23,7 @@ def run_phase3(
 
     lines = getattr(state, "service_lines", []) or []
     for line in lines:
-        should_deliver = (
-            line.authorization_status == "approved"
-            or (line.authorization_status == "modified" and line.accepted_modification)
-            or line.treat_anyway
-        )
-        if should_deliver:
+        if _is_line_deliverable(line):
             line.delivered = True
 
     adapter = Phase3Adapter(
@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import json
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage
-from langchain_core.messages.system import SystemMessage
-
 from src.utils.prompts.phase3_prompts import (
     create_phase3_payor_system_prompt,
     create_phase3_payor_user_prompt,
     create_phase3_provider_system_prompt,
     create_phase3_provider_user_prompt,
+    render_phase3_prior_round,
+)
+from src.sim.transitions import (
+    _all_lines_terminal_phase3,
+    apply_phase3_insurer_line_adjudications,
+    apply_phase3_provider_bundle_action,
 )
-from src.sim.transitions import apply_phase3_insurer_line_adjudications, apply_phase3_provider_bundle_action
 from src.utils.json_parsing import extract_json_from_text
+from src.utils.llm_invoke import invoke_text
+from src.utils.prompts.config import PROVIDER_STRATEGY_GUIDANCE
+from src.utils.prompts.schema_definitions import PROVIDER_ACTION_SCHEMA, PROVIDER_ACTION_JSON
 
 Delta = Dict[str, Any]
 
 
+def _action_system_prompt(guidance: str) -> str:
+    strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
+    return (
+        "PHASE 3 PROVIDER ACTION DECISION\n"
+        "You are a hospital provider team deciding how to respond to the claim adjudication.\n"
+        f"{strategy_block}"
+        f"{PROVIDER_ACTION_SCHEMA}\n"
+        "Phase 3 notes:\n"
+        "- ABANDON uses WRITE_OFF mode only (write off unpaid claim amount)\n"
+        "- RESUBMIT = corrected claim submission; withdraws current claim and resubmits at level 0\n"
+        "Respond only with valid JSON matching the schema."
+    )
+
+
+# static per strategy: built once so every call sends a byte-identical prefix (provider-side prompt caching)
+_ACTION_SYSTEM_PROMPTS: Dict[str, str] = {
+    strategy: _action_system_prompt(guidance) for strategy, guidance in PROVIDER_STRATEGY_GUIDANCE.items()
+}
+_ACTION_SYSTEM_PROMPT_NO_STRATEGY = _action_system_prompt("")
+
+
 def _provider_params(state, adapter_params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     if adapter_params is not None:
         return adapter_params
@@ -39,11 +67,6 @@ def _payor_params(state, adapter_params: Optional[Dict[str, Any]]) -> Dict[str,
     return sp
 
 
-def _invoke(llm, system_text: str, user_text: str) -> str:
-    resp = llm.invoke([SystemMessage(content=system_text), HumanMessage(content=user_text)])
-    return resp.content
-
-
 def _parse_obj(text: str) -> Dict[str, Any]:
     obj = extract_json_from_text(text)
     if not isinstance(obj, dict):
@@ -181,7 +204,7 @@ def _payor_encounter_history(state) -> List[Dict[str, Any]]:
     return history
 
 
-def _prior_round_summaries(state) -> List[Dict[str, Any]]:
+def _prior_round_summaries(state, start: int = 0) -> List[Dict[str, Any]]:
     """
     Build detailed summaries of prior claim rounds for provider LLM context.
     """
@@ -189,7 +212,7 @@ def _prior_round_summaries(state) -> List[Dict[str, Any]]:
     submissions = state.phase3_submissions if state.phase3_submissions is not None else []
     responses = state.phase3_responses if state.phase3_responses is not None else []
 
-    for sub, resp in zip(submissions, responses):
+    for sub, resp in zip(submissions[start:], responses[start:]):
         if not isinstance(sub, dict):
             raise ValueError(f"phase3_submissions entry must be dict, got {type(sub)}")
         if not isinstance(resp, dict):
@@ -263,17 +286,12 @@ def build_phase3_provider_action_prompts(
     state, provider_params: Optional[Dict[str, Any]] = None
 ) -> Dict[str, str]:
     """Build system_prompt and user_prompt for Phase 3 provider action decision (for audit rewriter)."""
-    import json
-    from src.utils.prompts.schema_definitions import PROVIDER_ACTION_SCHEMA, PROVIDER_ACTION_JSON
 
     lines = state.service_lines
     if lines is None:
         raise ValueError("state.service_lines is None")
     level = _current_level(state)
     params = _provider_params(state, provider_params)
-    from src.utils.prompts.config import PROVIDER_STRATEGY_GUIDANCE
-    guidance = PROVIDER_STRATEGY_GUIDANCE.get(params.get("strategy"), "") or ""
-    strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
 
     abandon_action = "ABANDON (mode=WRITE_OFF)"
     line_statuses = []
@@ -308,16 +326,7 @@ def build_phase3_provider_action_prompts(
             "valid_actions": valid_actions,
         })
 
-    system_prompt = (
-        "PHASE 3 PROVIDER ACTION DECISION\n"
-        "You are a hospital provider team deciding how to respond to the claim adjudication.\n"
-        f"{strategy_block}"
-        f"{PROVIDER_ACTION_SCHEMA}\n"
-        "Phase 3 notes:\n"
-        "- ABANDON uses WRITE_OFF mode only (write off unpaid claim amount)\n"
-        "- RESUBMIT = corrected claim submission; withdraws current claim and resubmits at level 0\n"
-        "Respond only with valid JSON matching the schema."
-    )
+    system_prompt = _ACTION_SYSTEM_PROMPTS.get(params.get("strategy")) or _ACTION_SYSTEM_PROMPT_NO_STRATEGY
     user_prompt = (
         f"Current Review Level: {level}\n"
         f"Max Appeal Level: 2 (IRE - final for claims)\n"
@@ -346,6 +355,12 @@ def build_phase3_provider_action_prompts(
 class Phase3Adapter:
     phase_name = "phase_3_claims"
 
+    # attributes are read on every turn; slots make those fixed-offset loads
+    __slots__ = (
+        "provider_llm", "payor_llm", "provider_params", "payor_params", "audit_logger",
+        "_provider_system_prompt", "_prior_rounds_rendered", "_payor_system_prompt",
+    )
+
     def __init__(
         self,
         *,
@@ -361,8 +376,14 @@ class Phase3Adapter:
         self.payor_params = payor_params
         self.audit_logger = audit_logger
 
+        # system prompts depend only on params, which are fixed for the life of the adapter;
+        # interned so concurrent runs with the same params share one copy in their audit logs
+        self._provider_system_prompt: Optional[str] = None
+        self._payor_system_prompt: Optional[str] = None
+        # rendered PRIOR HISTORY rounds, extended as the phase progresses
+        self._prior_rounds_rendered: List[str] = []
+
     def is_terminal(self, state) -> bool:
-        from src.sim.transitions import _all_lines_terminal_phase3
         return _all_lines_terminal_phase3(state)
 
     def append_submission(self, state, submission: Dict[str, Any]) -> None:
@@ -377,15 +398,21 @@ class Phase3Adapter:
 
     def build_submission(self, state) -> Dict[str, Any]:
         level = _current_level(state)
-        prior_rounds = _prior_round_summaries(state)
-
-        params = _provider_params(state, self.provider_params)
-        sys_txt = create_phase3_provider_system_prompt(params)
+        # submission/response history is append-only, so only rounds completed since
+        # the last turn are summarized and rendered; earlier rounds reuse their text
+        rendered = self._prior_rounds_rendered
+        for r in _prior_round_summaries(state, start=len(rendered)):
+            rendered.append(render_phase3_prior_round(len(rendered), r))
+
+        if self._provider_system_prompt is None:
+            params = _provider_params(state, self.provider_params)
+            self._provider_system_prompt = sys.intern(create_phase3_provider_system_prompt(params))
+        sys_txt = self._provider_system_prompt
         user_txt = create_phase3_provider_user_prompt(
-            state, turn=state.turn, level=level, prior_rounds=prior_rounds
+            state, turn=state.turn, level=level, prior_rounds_rendered=rendered
         )
 
-        draft = _invoke(self.provider_llm, sys_txt, user_txt)
+        draft = invoke_text(self.provider_llm, sys_txt, user_txt)
         parsed = _parse_obj(draft)
 
         claim_submission = parsed.get("claim_submission")
@@ -423,14 +450,16 @@ class Phase3Adapter:
         pend_count = _pend_count_at_level(state, level)
         encounter_history = _payor_encounter_history(state)
 
-        params = _payor_params(state, self.payor_params)
-        sys_txt = create_phase3_payor_system_prompt(params)
+        if self._payor_system_prompt is None:
+            params = _payor_params(state, self.payor_params)
+            self._payor_system_prompt = sys.intern(create_phase3_payor_system_prompt(params))
+        sys_txt = self._payor_system_prompt
         user_txt = create_phase3_payor_user_prompt(
             state, claim_submission, turn=state.turn, level=level,
             pend_count_at_level=pend_count, encounter_history=encounter_history
         )
 
-        draft = _invoke(self.payor_llm, sys_txt, user_txt)
+        draft = invoke_text(self.payor_llm, sys_txt, user_txt)
         parsed = _parse_obj(draft)
 
         if not isinstance(parsed.get("line_adjudications"), list):
@@ -501,8 +530,6 @@ class Phase3Adapter:
         LLM-based provider action decision for claims phase.
         Note: _submission and _response kept for API compatibility with Phase2Adapter.
         """
-        from src.utils.prompts.schema_definitions import PROVIDER_ACTION_SCHEMA, PROVIDER_ACTION_JSON
-
         lines = state.service_lines
         if lines is None:
             raise ValueError("state.service_lines is None")
@@ -551,22 +578,8 @@ class Phase3Adapter:
             })
 
         params = _provider_params(state, self.provider_params)
-        from src.utils.prompts.config import PROVIDER_STRATEGY_GUIDANCE
-        guidance = PROVIDER_STRATEGY_GUIDANCE[params["strategy"]]
-        strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
-
-        system_prompt = (
-            "PHASE 3 PROVIDER ACTION DECISION\n"
-            "You are a hospital provider team deciding how to respond to the claim adjudication.\n"
-            f"{strategy_block}"
-            f"{PROVIDER_ACTION_SCHEMA}\n"
-            "Phase 3 notes:\n"
-            "- ABANDON uses WRITE_OFF mode only (write off unpaid claim amount)\n"
-            "- RESUBMIT = corrected claim submission; withdraws current claim and resubmits at level 0\n"
-            "Respond only with valid JSON matching the schema."
-        )
+        system_prompt = _ACTION_SYSTEM_PROMPTS[params["strategy"]]
 
-        import json
         user_prompt = (
             f"Current Review Level: {level}\n"
             f"Max Appeal Level: 2 (IRE - final for claims)\n"
@@ -590,7 +603,7 @@ class Phase3Adapter:
             f"Return only valid JSON:\n{PROVIDER_ACTION_JSON}"
         )
 
-        raw = _invoke(self.provider_llm, system_prompt, user_prompt)
+        raw = invoke_text(self.provider_llm, system_prompt, user_prompt)
         parsed = _parse_obj(raw)
 
         if self.audit_logger:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, Dict, List, Optional
 from src.models.state import EncounterState
+from src.data.pricing.cms_rates import check_code_match, compute_utilities, get_code_info, to_cents
 from src.models.metrics import FrictionMetrics, PolicyReference, EnvironmentConfig
 from src.utils.audit_logger import AuditLogger
 
@@ -60,137 +61,141 @@ def run_phase4(
 
 
 def _calculate_metrics(state: EncounterState) -> FrictionMetrics:
-    from src.data.pricing.cms_rates import (
-        lookup_rate,
-        UnknownProcedureCodeError,
-        check_code_match,
-        get_description,
-        ADMIN_COST_PROVIDER_L0,
-        ADMIN_COST_INSURER_L0,
-        ADMIN_COST_PROVIDER_L12,
-        ADMIN_COST_INSURER_L12,
-        IRE_CASE_COST,
-        PROMPT_PAY_RATE,
-        REVIEW_DELAY_DAYS,
-    )
-
-    metrics = FrictionMetrics()
     lines = getattr(state, "service_lines", []) or []
 
-    metrics.total_lines_requested = len(lines)
-
+    # tallies live in locals; the pydantic model is built once at the end instead of
+    # paying BaseModel.__setattr__ on every increment
+    approved_p2 = denied_p2 = modified_p2 = modified_accepted = 0
+    delivered = paid_p3 = denied_p3 = 0
+    max_level = 0
     unpriced: List[str] = []
     hallucination_warnings: List[str] = []
     line_pricing: List[Dict[str, Any]] = []
-    total_service_value = 0.0
-    total_reimbursement = 0.0
-    insurer_exposure = 0.0  # S^I: value of lines submitted to insurer
+    # money is summed in integer cents so totals are exact; dollars only at output
+    service_value_cents = 0  # S^I: value of lines submitted to insurer
+    reimbursement_cents = 0
 
     for line in lines:
         if line.authorization_status == "approved":
-            metrics.lines_approved_phase2 += 1
+            approved_p2 += 1
         elif line.authorization_status == "denied":
-            metrics.lines_denied_phase2 += 1
+            denied_p2 += 1
         elif line.authorization_status == "modified":
-            metrics.lines_modified_phase2 += 1
+            modified_p2 += 1
             if getattr(line, "accepted_modification", False):
-                metrics.lines_modified_accepted += 1
+                modified_accepted += 1
 
         if line.delivered:
-            metrics.lines_delivered += 1
+            delivered += 1
 
         if line.adjudication_status:
             if line.adjudication_status == "approved":
-                metrics.lines_paid_phase3 += 1
+                paid_p3 += 1
             elif line.adjudication_status == "denied":
-                metrics.lines_denied_phase3 += 1
+                denied_p3 += 1
 
-        metrics.max_appeal_level_reached = max(
-            metrics.max_appeal_level_reached, int(line.current_review_level)
-        )
+        max_level = max(max_level, int(line.current_review_level))
 
         code = line.procedure_code
         qty = line.requested_quantity
 
-        try:
-            rate = lookup_rate(code)
-        except UnknownProcedureCodeError:
+        # one table lookup per line for rate and description (unknown codes are unpriced)
+        info = get_code_info(code)
+        if info is None:
             unpriced.append(code)
             rate = None
+        else:
+            rate = info.rate
 
         is_consistent, warning = check_code_match(code, line.service_name)
         if warning:
             hallucination_warnings.append(warning)
 
-        sv = rate * qty if rate is not None and qty > 0 else 0.0
-        total_service_value += sv
-
-        insurer_exposure += sv
+        rate_cents = to_cents(rate) if rate is not None else 0
+        sv_cents = rate_cents * qty if rate is not None and qty > 0 else 0
+        service_value_cents += sv_cents
 
-        paid_value = 0.0
+        paid_cents = 0
         if line.adjudication_status == "approved" and rate is not None:
             paid_qty = line.approved_quantity if line.approved_quantity else qty
-            paid_value = rate * paid_qty
+            paid_cents = rate_cents * paid_qty
 
-        total_reimbursement += paid_value
+        reimbursement_cents += paid_cents
 
         line_pricing.append({
             "line_number": line.line_number,
             "procedure_code": code,
             "service_name": line.service_name,
-            "official_description": get_description(code),
+            "official_description": info.description if info else None,
             "is_consistent": is_consistent,
             "hallucination_warning": warning,
             "requested_quantity": qty,
             "rate": rate,
-            "service_value": round(sv, 2),
+            "service_value": sv_cents / 100,
             "paid": line.adjudication_status == "approved",
-            "paid_value": round(paid_value, 2),
+            "paid_value": paid_cents / 100,
         })
 
     phase2_submissions = getattr(state, "phase2_submissions", []) or []
-    metrics.phase2_turns = len(phase2_submissions)
+    phase2_turns = len(phase2_submissions)
 
     phase3_submissions = getattr(state, "phase3_submissions", []) or []
-    metrics.phase3_turns = len(phase3_submissions)
+    phase3_turns = len(phase3_submissions)
 
     phase2_responses = getattr(state, "phase2_responses", []) or []
-    phase3_submissions = getattr(state, "phase3_submissions", []) or []
     phase3_responses = getattr(state, "phase3_responses", []) or []
 
-    metrics.phase2_appeals, metrics.phase2_pends = _count_appeals_and_pends(phase2_responses)
-    metrics.phase3_appeals, metrics.phase3_pends = _count_appeals_and_pends(phase3_responses)
+    phase2_appeals, phase2_pends = _count_appeals_and_pends(phase2_responses)
+    phase3_appeals, phase3_pends = _count_appeals_and_pends(phase3_responses)
 
     # level-differentiated admin costs (CAQH 2023): L0+Phase3 at electronic rate, L1-2 at manual rate
     # count turns by level from phase2 responses
-    phase2_responses = getattr(state, "phase2_responses", []) or []
-    n_l0 = sum(1 for r in phase2_responses if isinstance(r, dict) and int(r.get("level", 0)) == 0)
-    n_l12 = sum(1 for r in phase2_responses if isinstance(r, dict) and int(r.get("level", 0)) > 0)
-    n_phase3 = metrics.phase3_turns  # phase3 claims adjudication at electronic rate
-
-    admin_p = (n_l0 + n_phase3) * ADMIN_COST_PROVIDER_L0 + n_l12 * ADMIN_COST_PROVIDER_L12
-    admin_i = (n_l0 + n_phase3) * ADMIN_COST_INSURER_L0 + n_l12 * ADMIN_COST_INSURER_L12
-
-    # IRE reversal costs: F_IRE if case reached L2; prompt-pay interest if IRE overturned denial
-    ire_cost = 0.0
-    if metrics.max_appeal_level_reached >= 2:
-        ire_cost += IRE_CASE_COST
-        # prompt-pay interest applies when IRE overturns and insurer must pay retroactively
-        if total_reimbursement > 0:
-            ire_cost += PROMPT_PAY_RATE * total_reimbursement * REVIEW_DELAY_DAYS / 365
-
-    metrics.total_service_value = round(total_service_value, 2)
-    metrics.total_reimbursement = round(total_reimbursement, 2)
-    metrics.total_admin_cost_provider = round(admin_p, 2)
-    metrics.total_admin_cost_insurer = round(admin_i, 2)
-    # alpha=1: admin costs weighted equally to financial outcomes (paper sensitivity parameter)
-    metrics.provider_utility = round(total_reimbursement - admin_p, 2)
-    metrics.insurer_utility = round(insurer_exposure - total_reimbursement - admin_i - ire_cost, 2)
-    metrics.line_pricing = line_pricing
-    metrics.unpriced_codes = sorted(set(unpriced))
-    metrics.hallucination_warnings = hallucination_warnings
-
-    return metrics
+    n_l0 = n_l12 = 0
+    for r in phase2_responses:
+        if not isinstance(r, dict):
+            continue
+        lvl = int(r.get("level", 0))
+        if lvl == 0:
+            n_l0 += 1
+        elif lvl > 0:
+            n_l12 += 1
+    n_phase3 = phase3_turns  # phase3 claims adjudication at electronic rate
+
+    u = compute_utilities(
+        n_l0=n_l0,
+        n_l12=n_l12,
+        n_phase3=n_phase3,
+        max_level=max_level,
+        service_value=service_value_cents / 100,
+        reimbursement=reimbursement_cents / 100,
+    )
+
+    return FrictionMetrics(
+        phase2_turns=phase2_turns,
+        phase2_appeals=phase2_appeals,
+        phase2_pends=phase2_pends,
+        max_appeal_level_reached=max_level,
+        total_lines_requested=len(lines),
+        lines_approved_phase2=approved_p2,
+        lines_denied_phase2=denied_p2,
+        lines_modified_phase2=modified_p2,
+        lines_modified_accepted=modified_accepted,
+        phase3_turns=phase3_turns,
+        phase3_appeals=phase3_appeals,
+        phase3_pends=phase3_pends,
+        lines_delivered=delivered,
+        lines_paid_phase3=paid_p3,
+        lines_denied_phase3=denied_p3,
+        total_service_value=service_value_cents / 100,
+        total_reimbursement=reimbursement_cents / 100,
+        total_admin_cost_provider=round(u.admin_provider, 2),
+        total_admin_cost_insurer=round(u.admin_insurer, 2),
+        provider_utility=round(u.provider_utility, 2),
+        insurer_utility=round(u.insurer_utility, 2),
+        line_pricing=line_pricing,
+        unpriced_codes=sorted(set(unpriced)),
+        hallucination_warnings=hallucination_warnings,
+    )
 
 
 def _count_appeals_and_pends(responses: list) -> tuple:
@@ -6,7 +6,7 @@ from typing import Any, Dict, Optional
 from src.models.patient import PatientVisibleData
 
 
-@dataclass
+@dataclass(slots=True)
 class Phase2PromptStateView:
     patient_visible_data: PatientVisibleData
     service_lines: Any
@@ -24,9 +24,10 @@ def build_phase2_prompt_state(state) -> Phase2PromptStateView:
     else:
         pv_model = pv
 
+    # positional, in field order
     return Phase2PromptStateView(
-        patient_visible_data=pv_model,
-        service_lines=getattr(state, "service_lines", []),
-        provider_policy_view=getattr(state, "provider_policy_view", None),
-        payor_policy_view=getattr(state, "payor_policy_view", None),
+        pv_model,
+        getattr(state, "service_lines", []),
+        getattr(state, "provider_policy_view", None),
+        getattr(state, "payor_policy_view", None),
     )
@@ -5,6 +5,7 @@ from src.sim.phase1 import run_phase1
 from src.sim.phase2 import run_phase2
 from src.sim.phase3 import run_phase3
 from src.sim.phase4 import run_phase4
+from src.sim.transitions import _is_line_deliverable
 from src.utils.audit_logger import AuditLogger
 from src.utils.environment import Environment
 
@@ -42,20 +43,8 @@ def run_full_simulation(
         environment=environment,
     )
 
-    # Check if any lines should be delivered to Phase 3
-    # Lines are deliverable if: approved, modified+accepted, or treat_anyway
-    def _should_deliver(line):
-        if getattr(line, "treat_anyway", False):
-            return True
-        status = getattr(line, "authorization_status", None)
-        if status == "approved":
-            return True
-        if status == "modified" and getattr(line, "accepted_modification", False):
-            return True
-        return False
-
-    deliverable_lines = [l for l in state.service_lines if _should_deliver(l)]
-    if not deliverable_lines:
+    # Phase 3 only runs if at least one line is deliverable; stop at the first one found
+    if not any(_is_line_deliverable(l) for l in state.service_lines):
         state.care_abandoned = True
 
     if state.care_abandoned:
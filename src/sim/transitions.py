@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from typing import Any, Dict, List, Optional, Tuple
 
+from src.utils.prompts.config import MAX_REQUEST_INFO_PER_LEVEL
+
 VALID_STATUSES = {"approved", "modified", "denied", "pending_info"}
 
 # normalize common LLM status variants
@@ -14,11 +15,14 @@ _STATUS_ALIASES = {
     "deny": "denied",
     "modify": "modified",
 }
+# canonical statuses map to themselves, so every line stores the same interned string
+# object instead of a fresh copy from each parsed LLM response (and == hits identity)
+_CANONICAL_STATUS = {**{st: st for st in VALID_STATUSES}, **_STATUS_ALIASES}
 
 
 def _normalize_status(status: str) -> str:
     s = status.lower().strip()
-    return _STATUS_ALIASES.get(s, s)
+    return _CANONICAL_STATUS.get(s, s)
 
 
 def _find_line(state, line_number: int):
@@ -85,8 +89,6 @@ def apply_phase2_insurer_line_adjudications(
         line.awaiting_response_at_level = None  # insurer has responded
 
         if status == "pending_info":
-            from src.utils.prompts.config import MAX_REQUEST_INFO_PER_LEVEL
-
             if line.pend_round >= MAX_REQUEST_INFO_PER_LEVEL:
                 raise ValueError(
                     f"line {ln} already pended {line.pend_round} times at level {line.current_review_level}; "
@@ -141,10 +143,10 @@ def apply_phase2_insurer_line_adjudications(
 def _is_line_terminal_phase2(line) -> bool:
     """Check if a line has reached terminal state in Phase 2."""
     # if awaiting insurer response at a level (appeal filed but not yet adjudicated), not terminal
-    if getattr(line, "awaiting_response_at_level", None) is not None:
+    if line.awaiting_response_at_level is not None:
         return False
 
-    auth_status = getattr(line, "authorization_status", None)
+    auth_status = line.authorization_status
     if auth_status is None:
         # Not yet reviewed by payor - need to get response first
         return False
@@ -154,15 +156,15 @@ def _is_line_terminal_phase2(line) -> bool:
         return True
 
     if status == "modified":
-        if getattr(line, "accepted_modification", False):
+        if line.accepted_modification:
             return True  # accepted the modification
-        if getattr(line, "abandoned", False):
+        if line.abandoned:
             return True  # gave up fighting
         # provider must still choose to accept modification or abandon (even at level 2)
         return False
 
     if status == "denied":
-        if getattr(line, "abandoned", False):
+        if line.abandoned:
             return True  # gave up
         # provider must still choose abandon mode (NO_TREAT or TREAT_ANYWAY), even at level 2
         return False
@@ -182,6 +184,16 @@ def _all_lines_terminal_phase2(state) -> bool:
     return all(_is_line_terminal_phase2(l) for l in lines)
 
 
+def _is_line_deliverable(line) -> bool:
+    """Lines reach Phase 3 if approved, modified+accepted, or treated anyway."""
+    if line.treat_anyway:
+        return True
+    status = line.authorization_status
+    if status == "approved":
+        return True
+    return status == "modified" and line.accepted_modification
+
+
 def apply_phase2_provider_bundle_action(
     *,
     state,
@@ -356,8 +368,6 @@ def apply_phase3_insurer_line_adjudications(
         line.awaiting_response_at_level = None  # insurer has responded
 
         if status == "pending_info":
-            from src.utils.prompts.config import MAX_REQUEST_INFO_PER_LEVEL
-
             if line.pend_round >= MAX_REQUEST_INFO_PER_LEVEL:
                 raise ValueError(
                     f"line {ln} already pended {line.pend_round} times at level {line.current_review_level}; "
@@ -412,13 +422,13 @@ def apply_phase3_insurer_line_adjudications(
 
 def _is_line_terminal_phase3(line) -> bool:
     """Check if a delivered line has reached terminal state in Phase 3."""
-    if not getattr(line, "delivered", False):
+    if not line.delivered:
         return True  # non-delivered lines are terminal (nothing to claim)
 
-    if getattr(line, "awaiting_response_at_level", None) is not None:
+    if line.awaiting_response_at_level is not None:
         return False
 
-    adj_status = getattr(line, "adjudication_status", None)
+    adj_status = line.adjudication_status
     if adj_status is None:
         return False
     status = str(adj_status).lower()
@@ -427,15 +437,15 @@ def _is_line_terminal_phase3(line) -> bool:
         return True
 
     if status == "modified":
-        if getattr(line, "accepted_modification", False):
+        if line.accepted_modification:
             return True
-        if getattr(line, "abandoned", False):
+        if line.abandoned:
             return True
         # provider must still choose (even at level 2)
         return False
 
     if status == "denied":
-        if getattr(line, "abandoned", False):
+        if line.abandoned:
             return True
         # provider must still choose WRITE_OFF (even at level 2)
         return False
@@ -449,7 +459,7 @@ def _all_lines_terminal_phase3(state) -> bool:
     lines = state.service_lines
     if lines is None:
         raise ValueError("state.service_lines is None")
-    delivered_lines = [l for l in lines if getattr(l, "delivered", False)]
+    delivered_lines = [l for l in lines if l.delivered]
     if not delivered_lines:
         raise ValueError("No delivered lines found - cannot check Phase 3 terminal status")
     return all(_is_line_terminal_phase3(l) for l in delivered_lines)
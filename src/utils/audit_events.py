@@ -1,10 +1,13 @@
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
-from src.models.audit import AuditEvent
+from typing import Any, Dict, Optional, get_args
+from src.models.audit import AuditEvent, AuditPhase
+
+_AUDIT_PHASES = frozenset(get_args(AuditPhase))
+_UTC = timezone.utc
 
 def now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return datetime.now(_UTC).isoformat().replace("+00:00", "Z")
 
 def make_event(
     *,
@@ -14,7 +17,11 @@ def make_event(
     payload: Optional[Dict[str, Any]] = None,
     actor: Optional[str] = None,
 ) -> AuditEvent:
-    return AuditEvent(
+    # events are built on every engine step; all fields come from our own code, so skip
+    # full pydantic validation and only keep the phase check the Literal used to enforce
+    if phase not in _AUDIT_PHASES:
+        raise ValueError(f"unknown audit phase: {phase}")
+    return AuditEvent.model_construct(
         ts=now_iso(),
         phase=phase,
         turn=turn,
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 from src.models.audit import AuditLog, AuditEvent
 from src.utils.audit_events import make_event, now_iso
 
+try:
+    # optional C serializer; audit logs carry every prompt and response, so this is the largest write per run
+    from orjson import dumps as _orjson_dumps, OPT_INDENT_2, OPT_NON_STR_KEYS
+except ImportError:
+    _orjson_dumps = None
+
 class AuditLogger:
+    __slots__ = ("audit_log",)
+
     def __init__(
         self,
         *,
@@ -75,5 +82,9 @@ class AuditLogger:
         return self.audit_log.model_dump()
 
     def save_json(self, filepath: str) -> None:
+        if _orjson_dumps is not None:
+            with open(filepath, "wb") as f:
+                f.write(_orjson_dumps(self.to_dict(), option=OPT_INDENT_2 | OPT_NON_STR_KEYS))
+            return
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(self.to_dict(), f, indent=2)
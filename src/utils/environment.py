@@ -1,6 +1,49 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.models.patient import PatientVisibleData
+from src.utils.json_parsing import extract_json_from_text
+from src.utils.llm_invoke import invoke_text
+
+# shared read-only default for optional sub-dicts (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# environment_hidden_data key holding results synthesized in earlier rounds, by procedure code;
+# kept apart from diagnostic_results_by_code so reused results are still reported as fabricated
+_SYNTHESIZED_KEY = "synthesized_results_by_code"
+
+# static output contract goes in the system message so every synthesis call shares the same
+# prefix; only the per-test and per-patient context varies in the user message
+_SYNTHESIS_SYSTEM_PROMPT = """You are a medical lab result generator.
+
+Return ONLY valid JSON. Use EXACTLY one of these two formats:
+
+For quantitative results (labs with numbers):
+{
+  "lab_results_delta": {
+    "<snake_case_key>": {"value": <number>, "units": "<string>"}
+  }
+}
+
+For qualitative results (positive/negative, or imaging findings):
+{
+  "lab_results_delta": {
+    "<snake_case_key>": {"result": "<string under 50 chars>"}
+  }
+}
+
+Rules:
+- Key must be snake_case derived from service_name
+- Return exactly one key-value pair
+- No narratives or extra text outside the JSON
+"""
+
+
 class Environment:
+    __slots__ = ("synthesis_llm", "allow_synthesis", "max_labs_per_test", "audit_logger")
+
     def __init__(
         self,
         *,
@@ -14,11 +57,11 @@ class Environment:
         self.max_labs_per_test = max_labs_per_test
         self.audit_logger = audit_logger
 
-    def _log(self, *, state, phase: str, turn: int, kind: str, payload: Dict[str, Any]) -> None:
-        if self.audit_logger is None:
+    def _log(self, audit_logger, *, state, phase: str, turn: int, kind: str, payload: Dict[str, Any]) -> None:
+        if audit_logger is None:
             return
         try:
-            self.audit_logger.log(
+            audit_logger.log(
                 phase=phase,
                 turn=turn,
                 kind=kind,
@@ -28,8 +71,32 @@ class Environment:
         except Exception:
             pass
 
-    def perform_approved_diagnostics(self, *, state) -> List[Dict[str, Any]]:
-        import json
+    def _synthesize(self, line, pv_json: str, ht_json: str) -> Tuple[str, Dict[str, Any]]:
+        """one LLM call generating results for a diagnostic line; returns (raw output, lab_results_delta)"""
+        service_name = getattr(line, "service_name", None) or ""
+        service_description = getattr(line, "service_description", None) or ""
+
+        prompt = f"""Generate simulated result for: {service_name}
+Description: {service_description}
+
+Patient context:
+{pv_json}
+
+Clinical context:
+{ht_json}
+"""
+        raw_llm_output = invoke_text(self.synthesis_llm, _SYNTHESIS_SYSTEM_PROMPT, prompt)
+        obj = extract_json_from_text(raw_llm_output)
+
+        if not isinstance(obj, dict) or not isinstance(obj.get("lab_results_delta"), dict):
+            raise ValueError("synthesis_llm returned invalid lab_results_delta JSON")
+
+        return raw_llm_output, obj["lab_results_delta"]
+
+    def perform_approved_diagnostics(self, *, state, audit_logger=None) -> List[Dict[str, Any]]:
+        """audit_logger is per run; falls back to the one given at construction"""
+        if audit_logger is None:
+            audit_logger = self.audit_logger
 
         pv_obj = getattr(state, "patient_visible_data", None)
         if pv_obj is None:
@@ -44,7 +111,7 @@ class Environment:
 
         ht = getattr(state, "environment_hidden_data", None)
         if ht is None:
-            ht = {}
+            ht = _EMPTY
         if not isinstance(ht, dict):
             raise ValueError("state.environment_hidden_data must be dict")
 
@@ -53,14 +120,21 @@ class Environment:
         if not isinstance(pv["lab_results"], dict):
             raise ValueError("patient_visible_data.lab_results must be dict")
 
-        results_by_code = ht.get("diagnostic_results_by_code", {})
+        results_by_code = ht.get("diagnostic_results_by_code")
         if results_by_code is None:
-            results_by_code = {}
+            results_by_code = _EMPTY
         if not isinstance(results_by_code, dict):
             raise ValueError("environment_hidden_data.diagnostic_results_by_code must be dict")
 
+        # approved lines stay approved across rounds; a result synthesized once is replayed
+        # from here instead of paying for (and possibly contradicting) a second LLM call
+        prior_synthesized = ht.get(_SYNTHESIZED_KEY) or _EMPTY
+
         deltas: List[Dict[str, Any]] = []
 
+        # collect approved diagnostic lines first: lines without ground truth each need an
+        # independent synthesis call, which are issued concurrently before results are applied
+        todo: List[Tuple[Any, str, Optional[Dict[str, Any]]]] = []
         for line in getattr(state, "service_lines", []) or []:
             if (getattr(line, "request_type", "") or "").lower() != "diagnostic_test":
                 continue
@@ -75,13 +149,35 @@ class Environment:
             if proc is None or str(proc).strip() == "":
                 continue
             proc = str(proc)
-
-            service_name = getattr(line, "service_name", None) or ""
-            service_description = getattr(line, "service_description", None) or ""
-
+            payload = results_by_code.get(proc)
+            if payload is None:
+                payload = prior_synthesized.get(proc)
+            todo.append((line, proc, payload))
+
+        synth_lines = [line for line, _, payload in todo if payload is None and self.allow_synthesis]
+        synthesized: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+        if synth_lines:
+            if self.synthesis_llm is None:
+                raise ValueError("allow_synthesis=True but synthesis_llm is None")
+            # every prompt sees the patient data as of this review round
+            pv_json = json.dumps(pv, ensure_ascii=False, indent=2)
+            ht_json = json.dumps(
+                {k: v for k, v in ht.items() if k != _SYNTHESIZED_KEY}, ensure_ascii=False, indent=2
+            )
+            if len(synth_lines) == 1:
+                outputs = [self._synthesize(synth_lines[0], pv_json, ht_json)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(synth_lines)) as pool:
+                    outputs = list(pool.map(lambda l: self._synthesize(l, pv_json, ht_json), synth_lines))
+            synthesized = {id(line): out for line, out in zip(synth_lines, outputs)}
+            if ht is not _EMPTY:
+                memo = ht.setdefault(_SYNTHESIZED_KEY, {})
+                for line, (_, delta) in zip(synth_lines, outputs):
+                    memo[str(line.procedure_code)] = delta
+
+        for line, proc, existing_payload in todo:
             # If we already have ground-truth (or previously synthesized) results for this procedure,
             # skip when all expected labs are already present in the current patient-visible data.
-            existing_payload = results_by_code.get(proc)
             if isinstance(existing_payload, dict) and existing_payload:
                 missing = {k: v for k, v in existing_payload.items() if k not in pv["lab_results"]}
                 if not missing:
@@ -89,67 +185,17 @@ class Environment:
 
             before = dict(pv["lab_results"])
 
-            payload = results_by_code.get(proc) if proc else None
-            fabricated = False
+            payload = existing_payload
+            fabricated = proc not in results_by_code and proc in prior_synthesized
             raw_llm_output: Optional[str] = None
 
-            if payload is None and self.allow_synthesis:
-                if self.synthesis_llm is None:
-                    raise ValueError("allow_synthesis=True but synthesis_llm is None")
-
-                pv_json = json.dumps(pv, ensure_ascii=False, indent=2)
-                ht_json = json.dumps(ht, ensure_ascii=False, indent=2)
-
-                prompt = f"""Generate simulated result for: {service_name}
-Description: {service_description}
-
-Patient context:
-{pv_json}
-
-Clinical context:
-{ht_json}
-
-Return ONLY valid JSON. Use EXACTLY one of these two formats:
-
-For quantitative results (labs with numbers):
-{{
-  "lab_results_delta": {{
-    "<snake_case_key>": {{"value": <number>, "units": "<string>"}}
-  }}
-}}
-
-For qualitative results (positive/negative, or imaging findings):
-{{
-  "lab_results_delta": {{
-    "<snake_case_key>": {{"result": "<string under 50 chars>"}}
-  }}
-}}
-
-Rules:
-- Key must be snake_case derived from service_name
-- Return exactly one key-value pair
-- No narratives or extra text outside the JSON
-"""
-                from langchain_core.messages import SystemMessage, HumanMessage
-                resp = self.synthesis_llm.invoke([
-                    SystemMessage(content="You are a medical lab result generator."),
-                    HumanMessage(content=prompt)
-                ])
-                raw_llm_output = resp.content
-                try:
-                    obj = json.loads(raw_llm_output)
-                except Exception:
-                    from src.utils.json_parsing import extract_json_from_text
-                    obj = extract_json_from_text(raw_llm_output)
-
-                if not isinstance(obj, dict) or not isinstance(obj.get("lab_results_delta"), dict):
-                    raise ValueError("synthesis_llm returned invalid lab_results_delta JSON")
-
-                payload = obj["lab_results_delta"]
+            if id(line) in synthesized:
+                raw_llm_output, payload = synthesized[id(line)]
                 fabricated = True
 
             if payload is None:
                 self._log(
+                    audit_logger,
                     state=state,
                     phase="phase_2_utilization_review",
                     turn=int(getattr(state, "turn", 0)),
@@ -167,6 +213,7 @@ Rules:
             pv["lab_results"].update(payload)
 
             self._log(
+                audit_logger,
                 state=state,
                 phase="phase_2_utilization_review",
                 turn=int(getattr(state, "turn", 0)),
@@ -193,7 +240,6 @@ Rules:
                 }
             )
 
-        from src.models.patient import PatientVisibleData
         state.patient_visible_data = PatientVisibleData(**pv)
 
         return deltas
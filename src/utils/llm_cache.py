@@ -0,0 +1,195 @@
+"""
+LLM response caching
+
+CachedLLM wraps a chat model and returns a stored response when the exact same
+messages were sent before, skipping the API call. caching makes repeated
+prompts return identical text, so it is opt-in (re-runs, temperature-0 suites).
+ResponseCache lives in memory for one process; DiskResponseCache persists
+across runs in a sqlite file.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def prompt_key(
+    messages,
+    namespace: str = "",
+    *,
+    normalize_whitespace: bool = False,
+    call_kwargs: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    sha256 over namespace + call kwargs + (role, content) of every message
+
+    call_kwargs are the invoke kwargs (stop, max_tokens, ...): they change the reply, so
+    calls differing only in them get different keys. no kwargs leaves the key as it was
+    before they were hashed, so persisted caches stay valid. normalize_whitespace
+    collapses every whitespace run to one space (and strips the ends) first, so prompts
+    differing only in layout share a key.
+    """
+    h = hashlib.sha256(namespace.encode())
+    if call_kwargs:
+        h.update(b"\x02")
+        h.update(json.dumps(call_kwargs, sort_keys=True, default=repr).encode())
+    for m in messages:
+        content = str(m.content)
+        if normalize_whitespace:
+            content = _WHITESPACE_RE.sub(" ", content).strip()
+        h.update(b"\x00")
+        h.update(m.type.encode())
+        h.update(b"\x01")
+        h.update(content.encode())
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    thread-safe in-memory store of response text by prompt key
+
+    bounded LRU: least recently used entries are evicted past maxsize, and
+    entries older than ttl seconds are treated as misses (ttl=None keeps them).
+    """
+
+    def __init__(self, *, maxsize: int = 10_000, ttl: Optional[float] = 3600.0):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._data[key] = (text, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class DiskResponseCache:
+    """
+    ResponseCache with the same get/put interface, persisted in a sqlite file
+
+    entries survive across processes so re-running an experiment replays earlier
+    responses. bounded LRU by last use; ttl=None (default) never expires entries.
+    """
+
+    def __init__(self, path: str, *, maxsize: int = 100_000, ttl: Optional[float] = None):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+            "created REAL NOT NULL, used REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        # wall clock, not monotonic: timestamps are compared across processes
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._size -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO responses (key, text, created, used) VALUES (?, ?, ?, ?)",
+                (key, text, now, now),
+            )
+            if cur.rowcount == 0:
+                self._db.execute(
+                    "UPDATE responses SET text = ?, created = ?, used = ? WHERE key = ?", (text, now, now, key)
+                )
+            self._size += cur.rowcount
+            if self._size > self.maxsize:
+                excess = self._size - self.maxsize
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used LIMIT ?)",
+                    (excess,),
+                )
+                self._size -= excess
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachedLLM:
+    """
+    chat model shim: invoke(messages) checks the cache first, calls through on miss
+
+    namespace separates callers that must never share responses even for
+    identical text (e.g. different models or agent roles). cache may be a
+    ResponseCache or a DiskResponseCache. normalize_whitespace widens hits to
+    prompts that differ only in whitespace (see prompt_key); meaning-level
+    paraphrases still miss, so a hit never replays an answer to a different question.
+    """
+
+    def __init__(self, llm, cache=None, *, namespace: str = "", normalize_whitespace: bool = False):
+        self.llm = llm
+        self.cache = cache if cache is not None else ResponseCache()
+        self.namespace = namespace
+        self.normalize_whitespace = normalize_whitespace
+
+    def invoke(self, messages, **kwargs):
+        key = prompt_key(
+            messages, self.namespace, normalize_whitespace=self.normalize_whitespace, call_kwargs=kwargs
+        )
+        text = self.cache.get(key)
+        if text is not None:
+            return AIMessage(content=text, additional_kwargs={"cache_hit": True})
+        resp = self.llm.invoke(messages, **kwargs)
+        self.cache.put(key, resp.content)
+        return resp
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
@@ -0,0 +1,369 @@
+"""
+azure openai client construction
+
+all agents (provider, payor, environment synthesis) share one pooled httpx
+client per process so TLS handshakes and keep-alive connections are reused
+across calls instead of each model instance opening its own pool.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional
+
+import httpx
+from langchain_core.messages import AIMessage
+from langchain_openai import AzureChatOpenAI, ChatOpenAI
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+# multiplex concurrent calls over one connection when the optional h2 package is installed
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# transient API failures worth retrying or failing over: 429s, timeouts, dropped connections, 5xx
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+# the openai SDK's own retry count; pass max_retries=0 when RetryingLLM does the retrying,
+# otherwise each of its attempts is retried again inside the client
+SDK_MAX_RETRIES = 2
+
+# server-side JSON mode: every agent prompt asks for a JSON object, so the reply is
+# guaranteed parseable and never wrapped in prose or code fences
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.Client:
+    """process-wide pooled sync client"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=HTTP2)
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """process-wide pooled async client (used by ainvoke paths)"""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT, http2=HTTP2)
+        return _async_http_client
+
+
+async def aclose_http_clients() -> None:
+    """close both shared clients; the next get_*_http_client call opens fresh ones"""
+    global _http_client, _async_http_client
+    with _lock:
+        client, async_client = _http_client, _async_http_client
+        _http_client = _async_http_client = None
+        # cached models hold the old clients
+        _build_azure_llm.cache_clear()
+        _build_vllm_llm.cache_clear()
+    if client is not None:
+        client.close()
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def create_azure_llm(
+    *,
+    deployment: Optional[str] = None,
+    api_version: Optional[str] = None,
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    max_retries: int = SDK_MAX_RETRIES,
+) -> AzureChatOpenAI:
+    """
+    AzureChatOpenAI from AZURE_OPENAI_* env vars on the shared http clients
+
+    callers asking for the same resolved config (e.g. provider and payor on one
+    deployment) get the same model instance. max_tokens caps each reply (None: no cap).
+    max_retries is the client's own retry count (0 under RetryingLLM).
+    """
+    return _build_azure_llm(
+        os.getenv("AZURE_OPENAI_ENDPOINT"),
+        deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+        api_version or os.getenv("AZURE_OPENAI_API_VERSION"),
+        os.getenv("AZURE_OPENAI_API_KEY"),
+        json_mode,
+        max_tokens,
+        max_retries,
+    )
+
+
+@lru_cache(maxsize=16)
+def _build_azure_llm(
+    endpoint: Optional[str],
+    deployment: Optional[str],
+    api_version: Optional[str],
+    api_key: Optional[str],
+    json_mode: bool,
+    max_tokens: Optional[int],
+    max_retries: int,
+) -> AzureChatOpenAI:
+    model_kwargs = {"response_format": JSON_RESPONSE_FORMAT} if json_mode else {}
+    return AzureChatOpenAI(
+        azure_endpoint=endpoint,
+        azure_deployment=deployment,
+        api_version=api_version,
+        api_key=api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        model_kwargs=model_kwargs,
+        max_tokens=max_tokens,
+        max_retries=max_retries,
+    )
+
+
+def create_vllm_llm(
+    *,
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    max_retries: int = SDK_MAX_RETRIES,
+) -> ChatOpenAI:
+    """
+    ChatOpenAI against a self-hosted vLLM OpenAI-compatible server (VLLM_ENDPOINT, VLLM_MODEL,
+    optional VLLM_API_KEY) on the shared http clients
+
+    run the server with --enable-prefix-caching: every agent call opens with its
+    fixed system prompt, so those KV blocks are computed once and reused across
+    turns and runs.
+    """
+    return _build_vllm_llm(
+        os.getenv("VLLM_ENDPOINT"),
+        os.getenv("VLLM_MODEL"),
+        os.getenv("VLLM_API_KEY") or "EMPTY",
+        json_mode,
+        max_tokens,
+        max_retries,
+    )
+
+
+@lru_cache(maxsize=16)
+def _build_vllm_llm(
+    endpoint: Optional[str],
+    model: Optional[str],
+    api_key: str,
+    json_mode: bool,
+    max_tokens: Optional[int],
+    max_retries: int,
+) -> ChatOpenAI:
+    if not endpoint or not model:
+        raise ValueError("VLLM_ENDPOINT and VLLM_MODEL must both be set")
+    model_kwargs = {"response_format": JSON_RESPONSE_FORMAT} if json_mode else {}
+    return ChatOpenAI(
+        base_url=endpoint,
+        model=model,
+        api_key=api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        model_kwargs=model_kwargs,
+        max_tokens=max_tokens,
+        max_retries=max_retries,
+    )
+
+
+class LLMPool:
+    """
+    spread calls over several deployments to raise aggregate RPM/TPM
+
+    each call goes to the deployment with the fewest in-flight requests
+    (ties rotate); on a transient error (429, timeout, 5xx) the call fails over
+    to the next deployment.
+
+    circuit breaker: a deployment that fails fail_threshold calls in a row is
+    skipped for recovery_timeout seconds, so a dead deployment fails fast instead
+    of costing every call a timeout. if all are open, all are tried. the breaker
+    only routes between deployments: a single deployment (or a vLLM server) is not
+    pooled and has none, since there is nothing to route to.
+    """
+
+    def __init__(self, llms: List, *, fail_threshold: int = 5, recovery_timeout: float = 30.0):
+        if not llms:
+            raise ValueError("LLMPool needs at least one llm")
+        self.llms = list(llms)
+        self.fail_threshold = fail_threshold
+        self.recovery_timeout = recovery_timeout
+        self._inflight = [0] * len(self.llms)
+        self._failures = [0] * len(self.llms)
+        self._open_until = [0.0] * len(self.llms)
+        self._rotation = 0
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> List[int]:
+        n = len(self.llms)
+        now = time.monotonic()
+        with self._lock:
+            start = self._rotation
+            self._rotation = (self._rotation + 1) % n
+            order = sorted(range(n), key=lambda i: (self._inflight[i], (i - start) % n))
+            closed = [i for i in order if self._open_until[i] <= now]
+            return closed or order
+
+    def invoke(self, messages, **kwargs):
+        last_err: Optional[Exception] = None
+        for i in self._candidates():
+            with self._lock:
+                self._inflight[i] += 1
+            try:
+                resp = self.llms[i].invoke(messages, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                last_err = e
+                with self._lock:
+                    self._failures[i] += 1
+                    if self._failures[i] >= self.fail_threshold:
+                        self._open_until[i] = time.monotonic() + self.recovery_timeout
+            else:
+                with self._lock:
+                    self._failures[i] = 0
+                return resp
+            finally:
+                with self._lock:
+                    self._inflight[i] -= 1
+        raise last_err
+
+    def __getattr__(self, name):
+        if name == "llms":
+            raise AttributeError(name)
+        return getattr(self.llms[0], name)
+
+
+class RateLimitedLLM:
+    """
+    cap the number of API calls in flight across all concurrent runs
+
+    keeps bursty batch concurrency under the deployment's RPM/TPM quota so calls
+    queue locally instead of coming back as 429s that must be retried.
+    """
+
+    def __init__(self, llm, max_concurrent: int):
+        if max_concurrent <= 0:
+            raise ValueError(f"max_concurrent must be positive, got {max_concurrent}")
+        self.llm = llm
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def invoke(self, messages, **kwargs):
+        with self._slots:
+            return self.llm.invoke(messages, **kwargs)
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+
+class RetryingLLM:
+    """
+    retry transient API failures with full-jitter exponential backoff
+
+    a run is a chain of dependent turns, so one 429 or timeout would otherwise
+    fail the whole run and waste every call already made for it. the wait before
+    retry k is uniform in [0, min(max_delay, base_delay * 2**k)] seconds. build the
+    wrapped clients with max_retries=0 so each attempt is a single request, and put
+    RateLimitedLLM inside this wrapper so backoff sleeps hold no slot.
+    """
+
+    def __init__(self, llm, *, max_attempts: int = 6, base_delay: float = 1.0, max_delay: float = 60.0):
+        if max_attempts <= 0:
+            raise ValueError(f"max_attempts must be positive, got {max_attempts}")
+        self.llm = llm
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def invoke(self, messages, **kwargs):
+        for attempt in range(self.max_attempts - 1):
+            try:
+                return self.llm.invoke(messages, **kwargs)
+            except RETRYABLE_ERRORS:
+                time.sleep(random.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+        return self.llm.invoke(messages, **kwargs)
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+
+class StopAtJSONEndLLM:
+    """
+    invoke() by streaming, and stop reading once the first top-level JSON object closes
+
+    agents reply with a single JSON object; whatever a model writes after it (closing
+    remarks, a restated rationale) is never parsed, so it is not waited for either.
+    braces inside JSON strings are skipped. with json_mode the reply ends at the
+    object anyway, so this only helps free-form replies.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    def invoke(self, messages, **kwargs):
+        parts: List[str] = []
+        depth = 0
+        in_str = escaped = False
+        stream = self.llm.stream(messages, **kwargs)
+        try:
+            for chunk in stream:
+                text = chunk.content
+                for i, c in enumerate(text):
+                    if in_str:
+                        if escaped:
+                            escaped = False
+                        elif c == "\\":
+                            escaped = True
+                        elif c == '"':
+                            in_str = False
+                    elif c == "{":
+                        depth += 1
+                    elif depth:
+                        if c == '"':
+                            in_str = True
+                        elif c == "}":
+                            depth -= 1
+                            if depth == 0:
+                                parts.append(text[: i + 1])
+                                return AIMessage(content="".join(parts))
+                parts.append(text)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return AIMessage(content="".join(parts))
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+
+def create_azure_llm_pool(
+    *,
+    json_mode: bool = False,
+    stop_at_json_end: bool = False,
+    max_tokens: Optional[int] = None,
+    max_retries: int = SDK_MAX_RETRIES,
+):
+    """
+    one model per deployment listed in AZURE_OPENAI_DEPLOYMENT_NAMES (comma-separated),
+    falling back to the single AZURE_OPENAI_DEPLOYMENT_NAME
+
+    stop_at_json_end streams each call and returns as soon as the reply's JSON object closes.
+    """
+    names = [n.strip() for n in os.getenv("AZURE_OPENAI_DEPLOYMENT_NAMES", "").split(",") if n.strip()]
+    llms = [
+        create_azure_llm(deployment=n, json_mode=json_mode, max_tokens=max_tokens, max_retries=max_retries)
+        for n in names or [None]
+    ]
+    if stop_at_json_end:
+        llms = [StopAtJSONEndLLM(m) for m in llms]
+    return llms[0] if len(llms) == 1 else LLMPool(llms)
@@ -0,0 +1,76 @@
+"""
+shared LLM invocation helpers
+
+every agent call is a (system, user) pair. system prompts are fixed per
+adapter, so their message objects are built once and reused; only the user
+message is allocated per call. the two-message list is built directly rather
+than through a ChatPromptTemplate: the prompt builders already return final
+strings, and format_messages would re-run template formatting and validation
+on every call for no gain.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.utils.llm_cache import prompt_key
+
+
+@lru_cache(maxsize=256)
+def system_message(text: str) -> SystemMessage:
+    """shared SystemMessage per distinct system prompt text"""
+    return SystemMessage(content=text)
+
+
+def invoke_text(llm, system_text: str, user_text: str) -> str:
+    """invoke llm with a system + user prompt and return the response text"""
+    resp = llm.invoke([system_message(system_text), HumanMessage(content=user_text)])
+    return resp.content
+
+
+class DedupLLM:
+    """
+    collapse identical in-flight calls across concurrent runs
+
+    while one thread is waiting on a prompt, any other thread sending the
+    exact same messages waits on that call's result instead of paying for a
+    second request. calls with different invoke kwargs never share. completed calls
+    are not cached.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def invoke(self, messages, **kwargs):
+        key = prompt_key(messages, call_kwargs=kwargs)
+        with self._lock:
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+        if not owner:
+            return fut.result()
+
+        try:
+            resp = self.llm.invoke(messages, **kwargs)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(resp)
+            return resp
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
@@ -1,6 +1,7 @@
 from .config import (
     MAX_TURNS_SAFETY_LIMIT,
     MAX_REQUEST_INFO_PER_LEVEL,
+    STALL_TURN_LIMIT,
     NOISE_PROBABILITY,
     WORKFLOW_LEVELS,
     LEVEL_NAME_MAP,
@@ -20,6 +21,7 @@ from .phase2_prompts import (
     create_phase2_provider_user_prompt,
     create_phase2_payor_system_prompt,
     create_phase2_payor_user_prompt,
+    render_phase2_prior_round,
 )
 
 from .phase3_prompts import (
@@ -27,4 +29,5 @@ from .phase3_prompts import (
     create_phase3_provider_user_prompt,
     create_phase3_payor_system_prompt,
     create_phase3_payor_user_prompt,
+    render_phase3_prior_round,
 )
@@ -29,6 +29,10 @@ VALID_ABANDON_MODES_PHASE3: Set[str] = {"WRITE_OFF"}
 # simulation caps: code should raise if violated (no silent defaults)
 MAX_TURNS_SAFETY_LIMIT: int = 15  # fallback to avoid infinite loops; agents don't know about this
 MAX_REQUEST_INFO_PER_LEVEL: int = 5  # was set to 2 for realism, now 5 to observe behavior; avoid inf loop as well
+# stop a phase after this many consecutive turns repeating the previous turn's decisions (line statuses +
+# provider action, ignoring reasons); 0 disables. off by default: pend/appeal rounds are what the experiments
+# measure, and MAX_REQUEST_INFO_PER_LEVEL is the deliberate cap on them
+STALL_TURN_LIMIT: int = 0
 
 # optional experiment knob; you said you'd comment it out if not used
 NOISE_PROBABILITY: float = 0.0
@@ -37,6 +37,23 @@ from .schema_definitions import (
     PHASE2_PAYOR_RESPONSE_JSON,
 )
 
+# shared read-only default for optional sub-dicts (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# output-format tails of the user prompts are identical on every turn: built once at import
+_PROVIDER_OUTPUT_FORMAT = (
+    f"\nOUTPUT FORMAT:\n"
+    f"{PHASE2_PROVIDER_REQUEST_SCHEMA}\n"
+    f"Return only valid JSON:\n"
+    f"{PHASE2_PROVIDER_REQUEST_JSON}"
+)
+_PAYOR_OUTPUT_FORMAT = (
+    f"\nOUTPUT FORMAT:\n"
+    f"{PHASE2_PAYOR_RESPONSE_SCHEMA}\n"
+    f"Return only valid JSON:\n"
+    f"{PHASE2_PAYOR_RESPONSE_JSON}"
+)
+
 
 def _normalize_patient_visible_data(pv: object) -> Dict[str, Any]:
     if hasattr(pv, "model_dump"):
@@ -101,7 +118,7 @@ def create_phase2_provider_system_prompt(provider_params: Optional[Dict[str, Any
             "\nCLINICAL GUIDELINES:\n"
             f"Source: {policy.get('issuer', 'Unknown')}\n"
         )
-        data = policy.get("content", {}).get("data", {})
+        data = (policy.get("content") or _EMPTY).get("data")
         if data:
             policy_block += _render_policy_data(data) + "\n"
 
@@ -113,7 +130,7 @@ def create_phase2_provider_system_prompt(provider_params: Optional[Dict[str, Any
             "\nPAYER COVERAGE POLICY (for reference when constructing your request):\n"
             f"Source: {coverage_policy.get('issuer', 'Unknown')}\n"
         )
-        data = coverage_policy.get("content", {}).get("data", {})
+        data = (coverage_policy.get("content") or _EMPTY).get("data")
         if data:
             coverage_policy_block += _render_policy_data(data) + "\n"
 
@@ -175,15 +192,52 @@ def _render_service_lines_state(state: object) -> str:
     return "\n".join(parts) + "\n"
 
 
+def render_phase2_prior_round(idx: int, r: Dict[str, Any]) -> str:
+    """one round of the provider's PRIOR SUBMISSION HISTORY block (idx is 0-based)"""
+    lvl = r.get("level", 0)
+    prior_lines = [f"\n--- Round {idx + 1} (Level {lvl}) ---"]
+
+    requested = r.get("requested_services", [])
+    if requested:
+        prior_lines.append("Requested:")
+        for svc in requested:
+            prior_lines.append(
+                f"  - line {svc.get('line_number')}: {svc.get('procedure_code')} "
+                f"({svc.get('code_type')}) {svc.get('service_name')}"
+            )
+
+    outcomes = r.get("line_outcomes", [])
+    if outcomes:
+        prior_lines.append("Payor response:")
+        for out in outcomes:
+            status = out.get("status", "unknown")
+            reason = out.get("decision_reason", "")
+            docs = out.get("requested_documents", [])
+            mod = out.get("modification_type", "")
+
+            out_str = f"  - line {out.get('line_number')}: {status}"
+            if reason:
+                out_str += f" | reason: {reason[:100]}"
+            if docs:
+                out_str += f" | requested_docs: {docs}"
+            if mod:
+                out_str += f" | modification: {mod}"
+            prior_lines.append(out_str)
+
+    return "\n".join(prior_lines)
+
+
 def create_phase2_provider_user_prompt(
     state: object,
     *,
     turn: int,
     level: int,
-    prior_rounds: Optional[List[Dict[str, Any]]] = None
+    prior_rounds: Optional[List[Dict[str, Any]]] = None,
+    prior_rounds_rendered: Optional[List[str]] = None,
 ) -> str:
     """
     User prompt: WHAT you're looking at, WHAT to do (changes per turn)
+    prior_rounds_rendered: render_phase2_prior_round output per round, used instead of prior_rounds
     Structure:
       1. TASK (what to do) - first for clarity
       2. Context metadata (turn, level)
@@ -195,12 +249,10 @@ def create_phase2_provider_user_prompt(
     if prior_rounds is None:
         prior_rounds = []
     pv = _normalize_patient_visible_data(state.patient_visible_data)
-    vitals = pv.get("vital_signs")
-    if vitals is None:
-        vitals = {}
-    labs = pv.get("lab_results")
-    if labs is None:
-        labs = {}
+    # missing/None fields fall back to shared sentinels (`or` is exact here: every
+    # falsy value of these types renders the same as its default)
+    vitals = pv.get("vital_signs") or _EMPTY
+    labs = pv.get("lab_results") or _EMPTY
 
     # 1. TASK - different for turn 0 vs continuation
     service_lines_block = _render_service_lines_state(state)
@@ -220,62 +272,19 @@ def create_phase2_provider_user_prompt(
         )
 
     # 4. Prior history (if any)
+    if prior_rounds_rendered is None:
+        prior_rounds_rendered = [render_phase2_prior_round(idx, r) for idx, r in enumerate(prior_rounds)]
     prior_block = ""
-    if prior_rounds:
-        prior_lines = ["PRIOR SUBMISSION HISTORY:"]
-        for idx, r in enumerate(prior_rounds):
-            lvl = r.get("level", 0)
-            prior_lines.append(f"\n--- Round {idx + 1} (Level {lvl}) ---")
-
-            requested = r.get("requested_services", [])
-            if requested:
-                prior_lines.append("Requested:")
-                for svc in requested:
-                    prior_lines.append(
-                        f"  - line {svc.get('line_number')}: {svc.get('procedure_code')} "
-                        f"({svc.get('code_type')}) {svc.get('service_name')}"
-                    )
-
-            outcomes = r.get("line_outcomes", [])
-            if outcomes:
-                prior_lines.append("Payor response:")
-                for out in outcomes:
-                    status = out.get("status", "unknown")
-                    reason = out.get("decision_reason", "")
-                    docs = out.get("requested_documents", [])
-                    mod = out.get("modification_type", "")
-
-                    out_str = f"  - line {out.get('line_number')}: {status}"
-                    if reason:
-                        out_str += f" | reason: {reason[:100]}"
-                    if docs:
-                        out_str += f" | requested_docs: {docs}"
-                    if mod:
-                        out_str += f" | modification: {mod}"
-                    prior_lines.append(out_str)
-
-        prior_block = "\n".join(prior_lines) + "\n"
+    if prior_rounds_rendered:
+        prior_block = "\n".join(["PRIOR SUBMISSION HISTORY:", *prior_rounds_rendered]) + "\n"
 
     # 3. Patient data
-    medical_history = pv.get("medical_history")
-    if medical_history is None:
-        medical_history = []
-    medications = pv.get("medications")
-    if medications is None:
-        medications = []
-    presenting_symptoms = pv.get("presenting_symptoms")
-    if presenting_symptoms is None:
-        presenting_symptoms = ""
-    physical_exam = pv.get("physical_exam")
-    if physical_exam is None:
-        physical_exam = ""
-    clinical_notes = pv.get("clinical_notes")
-    if clinical_notes is None:
-        clinical_notes = ""
-
-    admission_source = pv.get("admission_source")
-    if admission_source is None:
-        admission_source = ""
+    medical_history = pv.get("medical_history") or ()
+    medications = pv.get("medications") or ()
+    presenting_symptoms = pv.get("presenting_symptoms") or ""
+    physical_exam = pv.get("physical_exam") or ""
+    clinical_notes = pv.get("clinical_notes") or ""
+    admission_source = pv.get("admission_source") or ""
 
     patient_block = (
         "PATIENT:\n"
@@ -312,12 +321,7 @@ def create_phase2_provider_user_prompt(
         parts.append(f"\n{service_lines_block}")
 
     # 6. OUTPUT FORMAT - last, closest to generation
-    parts.append(
-        f"\nOUTPUT FORMAT:\n"
-        f"{PHASE2_PROVIDER_REQUEST_SCHEMA}\n"
-        f"Return only valid JSON:\n"
-        f"{PHASE2_PROVIDER_REQUEST_JSON}"
-    )
+    parts.append(_PROVIDER_OUTPUT_FORMAT)
 
     return "".join(parts)
 
@@ -326,99 +330,6 @@ def create_phase2_provider_user_prompt(
 # PHASE 2 PAYOR PROMPTS
 # =============================================================================
 
-def create_phase2_provider_action_prompt(
-    state: object,
-    payor_response: Dict[str, Any],
-    *,
-    provider_params: Optional[Dict[str, Any]] = None,
-) -> Tuple[str, str]:
-    """
-    Provider prompt for deciding action AFTER seeing payor's response.
-    Returns (system_prompt, user_prompt).
-
-    This is where the strategic choice happens:
-    - Cooperate provider: accept modifications, provide docs promptly
-    - Defect provider: appeal aggressively, push back on denials/modifications
-    """
-    params = provider_params or {}
-
-    guidance = PROVIDER_STRATEGY_GUIDANCE[params["strategy"]]
-    strategy_block = f"\nSTRATEGY GUIDANCE:\n{guidance}\n" if guidance else ""
-
-    system_prompt = (
-        "PHASE 2 PROVIDER ACTION DECISION\n"
-        "You are the provider team deciding how to respond to the payor's decision.\n"
-        f"{strategy_block}"
-        "Respond only with valid JSON matching the schema.\n"
-        f"{WORKFLOW_ACTION_DEFINITIONS}"
-    )
-
-    # Render current line statuses after payor response was applied
-    lines = getattr(state, "service_lines", []) or []
-    line_status_parts = ["CURRENT LINE STATUSES (after payor decision):"]
-    for l in lines:
-        ln = getattr(l, "line_number", "?")
-        code = getattr(l, "procedure_code", "")
-        name = getattr(l, "service_name", "")
-        status = getattr(l, "authorization_status", None) or "not_reviewed"
-        level = getattr(l, "current_review_level", 0)
-        docs = getattr(l, "requested_documents", []) or []
-        reason = getattr(l, "decision_reason", "") or ""
-        accepted = getattr(l, "accepted_modification", False)
-        line_str = f"- line {ln}: {code} {name} | status={status} | level={level}"
-        if status == "modified":
-            line_str += f" | accepted={accepted}"
-        if status == "pending_info" and docs:
-            line_str += f" | requested_docs={docs}"
-        if reason:
-            line_str += f" | reason={reason[:80]}"
-        line_status_parts.append(line_str)
-
-    line_status_block = "\n".join(line_status_parts)
-
-    # Include payor's response summary
-    payor_adjs = payor_response.get("line_adjudications", [])
-    payor_summary_parts = ["PAYOR'S DECISION THIS TURN:"]
-    for adj in payor_adjs:
-        if isinstance(adj, dict):
-            ln = adj.get("line_number", "?")
-            st = adj.get("authorization_status", "?")
-            reason = adj.get("decision_reason", "")[:80] if adj.get("decision_reason") else ""
-            payor_summary_parts.append(f"- line {ln}: {st} | {reason}")
-    payor_summary_block = "\n".join(payor_summary_parts)
-
-    user_prompt = (
-        f"PHASE 2 PROVIDER ACTION PROMPT\n\n"
-        f"{line_status_block}\n\n"
-        f"{payor_summary_block}\n\n"
-        "TASK: Choose ONE action and provide per-line details where required.\n\n"
-        "ACTION OPTIONS:\n"
-        "1. CONTINUE - proceed without escalating review level\n"
-        "   REQUIRED: For each non-approved line, include in 'lines' array:\n"
-        "   - pending_info lines: {\"line_number\": X, \"intent\": \"PROVIDE_DOCS\"}\n"
-        "   - modified lines you accept: {\"line_number\": X, \"intent\": \"ACCEPT_MODIFY\"}\n"
-        "   (approved lines need no entry)\n\n"
-        "2. APPEAL - escalate denied/modified lines to next review level\n"
-        "   REQUIRED: For each line you appeal, include in 'lines' array:\n"
-        "   - {\"line_number\": X, \"to_level\": <current_level + 1>}\n"
-        "   Use when you DISAGREE with the coverage decision.\n\n"
-        "3. RESUBMIT - withdraw PA entirely, submit new/corrected request\n"
-        "   REQUIRED: Provide resubmit_reason explaining why.\n"
-        "   Use for: wrong codes, missing diagnoses, want different services.\n"
-        "   NOT a formal appeal - resets to level 0.\n\n"
-        "4. ABANDON - stop pursuit entirely\n"
-        "   REQUIRED: Set abandon_mode to NO_TREAT or TREAT_ANYWAY.\n\n"
-        "INTENT VALUES (only 2 options, use exactly as shown):\n"
-        "- \"PROVIDE_DOCS\" - for pending_info lines\n"
-        "- \"ACCEPT_MODIFY\" - for modified lines\n\n"
-        f"{PROVIDER_ACTION_SCHEMA}\n"
-        "Return only valid JSON:\n"
-        f"{PROVIDER_ACTION_JSON}\n"
-    )
-
-    return system_prompt, user_prompt
-
-
 def create_phase2_payor_system_prompt(
     payor_params: Optional[Dict[str, Any]] = None,
     level: int = 0,
@@ -456,7 +367,7 @@ def create_phase2_payor_system_prompt(
             f"\n{header}:\n"
             f"Source: {policy.get('issuer', 'Unknown')}\n"
         )
-        data = policy.get("content", {}).get("data", {})
+        data = (policy.get("content") or _EMPTY).get("data")
         if data:
             policy_block += _render_policy_data(data) + "\n"
 
@@ -468,7 +379,7 @@ def create_phase2_payor_system_prompt(
             "\nPROVIDER CLINICAL GUIDELINE (for reference when evaluating clinical justification):\n"
             f"Source: {guideline.get('issuer', 'Unknown')}\n"
         )
-        data = guideline.get("content", {}).get("data", {})
+        data = (guideline.get("content") or _EMPTY).get("data")
         if data:
             clinical_guideline_block += _render_policy_data(data) + "\n"
 
@@ -580,11 +491,6 @@ def create_phase2_payor_user_prompt(
     )
 
     # 6. OUTPUT FORMAT - last, closest to generation
-    parts.append(
-        f"\nOUTPUT FORMAT:\n"
-        f"{PHASE2_PAYOR_RESPONSE_SCHEMA}\n"
-        f"Return only valid JSON:\n"
-        f"{PHASE2_PAYOR_RESPONSE_JSON}"
-    )
+    parts.append(_PAYOR_OUTPUT_FORMAT)
 
     return "".join(parts)
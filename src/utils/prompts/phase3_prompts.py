@@ -33,6 +33,23 @@ from .schema_definitions import (
     PHASE3_PAYOR_RESPONSE_JSON,
 )
 
+# shared read-only default for optional sub-dicts (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# output-format tails of the user prompts are identical on every turn: built once at import
+_PROVIDER_OUTPUT_FORMAT = (
+    f"\nOUTPUT FORMAT:\n"
+    f"{PHASE3_PROVIDER_CLAIM_SCHEMA}\n"
+    f"Return only valid JSON:\n"
+    f"{PHASE3_PROVIDER_CLAIM_JSON}"
+)
+_PAYOR_OUTPUT_FORMAT = (
+    f"\nOUTPUT FORMAT:\n"
+    f"{PHASE3_PAYOR_RESPONSE_SCHEMA}\n"
+    f"Return only valid JSON:\n"
+    f"{PHASE3_PAYOR_RESPONSE_JSON}"
+)
+
 def _normalize_patient_visible_data(pv: object) -> Dict[str, Any]:
     if hasattr(pv, "model_dump"):
         pv = pv.model_dump()
@@ -77,7 +94,7 @@ def create_phase3_provider_system_prompt(provider_params: Optional[Dict[str, Any
             "\nCLINICAL GUIDELINES:\n"
             f"Source: {policy.get('issuer', 'Unknown')}\n"
         )
-        data = policy.get("content", {}).get("data", {})
+        data = (policy.get("content") or _EMPTY).get("data")
         if data:
             policy_block += _render_policy_data(data) + "\n"
 
@@ -88,7 +105,7 @@ def create_phase3_provider_system_prompt(provider_params: Optional[Dict[str, Any
             "\nPAYER COVERAGE POLICY (for reference):\n"
             f"Source: {coverage_policy.get('issuer', 'Unknown')}\n"
         )
-        data = coverage_policy.get("content", {}).get("data", {})
+        data = (coverage_policy.get("content") or _EMPTY).get("data")
         if data:
             coverage_policy_block += _render_policy_data(data) + "\n"
 
@@ -113,13 +130,52 @@ def create_phase3_provider_system_prompt(provider_params: Optional[Dict[str, Any
     )
 
 
+def render_phase3_prior_round(idx: int, r: Dict[str, Any]) -> str:
+    """one round of the provider's PRIOR CLAIM HISTORY block (idx is 0-based)"""
+    lvl = r.get("level", 0)
+    plines = [f"\n--- Round {idx + 1} (Level {lvl}) ---"]
+
+    # What was billed
+    billed = r.get("billed_lines", [])
+    if billed:
+        plines.append("Billed:")
+        for line in billed:
+            plines.append(
+                f"  - line {line.get('line_number')}: {line.get('procedure_code')} "
+                f"(auth: {line.get('authorization_number')})"
+            )
+
+    # What payor decided
+    outcomes = r.get("line_outcomes", [])
+    if outcomes:
+        plines.append("Payor response:")
+        for out in outcomes:
+            status = out.get("status", "unknown")
+            reason = out.get("decision_reason", "")
+            docs = out.get("requested_documents", [])
+            # paid = out.get("paid_amount")
+
+            out_str = f"  - line {out.get('line_number')}: {status}"
+            # if paid is not None:
+            #     out_str += f" | paid: ${paid}"
+            if reason:
+                out_str += f" | reason: {reason[:100]}"
+            if docs:
+                out_str += f" | requested_docs: {docs}"
+            plines.append(out_str)
+
+    return "\n".join(plines)
+
+
 def create_phase3_provider_user_prompt(
     state: object,
     *,
     turn: int,
     level: int,
-    prior_rounds: Optional[List[Dict[str, Any]]] = None
+    prior_rounds: Optional[List[Dict[str, Any]]] = None,
+    prior_rounds_rendered: Optional[List[str]] = None,
 ) -> str:
+    """prior_rounds_rendered: render_phase3_prior_round output per round, used instead of prior_rounds"""
     if prior_rounds is None:
         prior_rounds = []
     pv = _normalize_patient_visible_data(state.patient_visible_data)
@@ -141,43 +197,11 @@ def create_phase3_provider_user_prompt(
             "authorization_status": l.authorization_status,
         })
 
+    if prior_rounds_rendered is None:
+        prior_rounds_rendered = [render_phase3_prior_round(idx, r) for idx, r in enumerate(prior_rounds)]
     prior_block = ""
-    if prior_rounds:
-        plines = ["PRIOR CLAIM HISTORY:"]
-        for idx, r in enumerate(prior_rounds):
-            lvl = r.get("level", 0)
-            plines.append(f"\n--- Round {idx + 1} (Level {lvl}) ---")
-
-            # What was billed
-            billed = r.get("billed_lines", [])
-            if billed:
-                plines.append("Billed:")
-                for line in billed:
-                    plines.append(
-                        f"  - line {line.get('line_number')}: {line.get('procedure_code')} "
-                        f"(auth: {line.get('authorization_number')})"
-                    )
-
-            # What payor decided
-            outcomes = r.get("line_outcomes", [])
-            if outcomes:
-                plines.append("Payor response:")
-                for out in outcomes:
-                    status = out.get("status", "unknown")
-                    reason = out.get("decision_reason", "")
-                    docs = out.get("requested_documents", [])
-                    # paid = out.get("paid_amount")
-
-                    out_str = f"  - line {out.get('line_number')}: {status}"
-                    # if paid is not None:
-                    #     out_str += f" | paid: ${paid}"
-                    if reason:
-                        out_str += f" | reason: {reason[:100]}"
-                    if docs:
-                        out_str += f" | requested_docs: {docs}"
-                    plines.append(out_str)
-
-        prior_block = "\n" + "\n".join(plines) + "\n"
+    if prior_rounds_rendered:
+        prior_block = "\n" + "\n".join(["PRIOR CLAIM HISTORY:", *prior_rounds_rendered]) + "\n"
 
     # current claim state for turn 2+
     current_state_block = ""
@@ -248,12 +272,7 @@ def create_phase3_provider_user_prompt(
         parts.append(current_state_block)
 
     # 7. OUTPUT FORMAT - last, closest to generation
-    parts.append(
-        f"\nOUTPUT FORMAT:\n"
-        f"{PHASE3_PROVIDER_CLAIM_SCHEMA}\n"
-        f"Return only valid JSON:\n"
-        f"{PHASE3_PROVIDER_CLAIM_JSON}"
-    )
+    parts.append(_PROVIDER_OUTPUT_FORMAT)
 
     return "".join(parts)
 
@@ -270,7 +289,7 @@ def create_phase3_payor_system_prompt(payor_params: Optional[Dict[str, Any]] = N
             "\nCOVERAGE POLICY:\n"
             f"Source: {policy.get('issuer', 'Unknown')}\n"
         )
-        data = policy.get("content", {}).get("data", {})
+        data = (policy.get("content") or _EMPTY).get("data")
         if data:
             policy_block += _render_policy_data(data) + "\n"
 
@@ -281,7 +300,7 @@ def create_phase3_payor_system_prompt(payor_params: Optional[Dict[str, Any]] = N
             "\nPROVIDER CLINICAL GUIDELINE (for reference when evaluating clinical justification):\n"
             f"Source: {guideline.get('issuer', 'Unknown')}\n"
         )
-        data = guideline.get("content", {}).get("data", {})
+        data = (guideline.get("content") or _EMPTY).get("data")
         if data:
             clinical_guideline_block += _render_policy_data(data) + "\n"
 
@@ -386,11 +405,6 @@ def create_phase3_payor_user_prompt(
     )
 
     # 6. OUTPUT FORMAT - last, closest to generation
-    parts.append(
-        f"\nOUTPUT FORMAT:\n"
-        f"{PHASE3_PAYOR_RESPONSE_SCHEMA}\n"
-        f"Return only valid JSON:\n"
-        f"{PHASE3_PAYOR_RESPONSE_JSON}"
-    )
+    parts.append(_PAYOR_OUTPUT_FORMAT)
 
     return "".join(parts)
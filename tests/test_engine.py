@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import src.sim.engine as engine
+from src.sim.adapter_base import SimAdapter
+
+
+class RepeatingAdapter(SimAdapter):
+    """payor and provider give the same decisions every turn; prompts and raw text still vary"""
+
+    phase_name = "test_phase"
+
+    def __init__(self, decisions=None, reworded=False):
+        self.decisions = decisions
+        self.reworded = reworded
+        self.turns = 0
+
+    def build_submission(self, state):
+        return {"turn": state.turn}
+
+    def append_submission(self, state, submission):
+        pass
+
+    def build_response(self, state, submission):
+        decision = self.decisions[state.turn] if self.decisions else "denied"
+        reason = f"criteria not met (review {state.turn})" if self.reworded else "criteria not met"
+        adj = {"line_number": 1, "authorization_status": decision, "decision_reason": reason}
+        return {
+            "payor_response": {"line_adjudications": [adj]},
+            "raw": f"draft for turn {state.turn}",
+            "prompts": {"system_prompt": "sys", "user_prompt": f"Turn: {state.turn}"},
+        }
+
+    def append_response(self, state, response):
+        pass
+
+    def apply_response(self, state, response):
+        return []
+
+    def choose_provider_action(self, state, submission, response):
+        reasoning = f"attaching records, attempt {state.turn}" if self.reworded else "attaching records"
+        return {
+            "action": "LINE_ACTIONS",
+            "line_actions": [{"line_number": 1, "action": "PROVIDE_DOCS"}],
+            "reasoning": reasoning,
+        }
+
+    def apply_provider_action(self, state, provider_action):
+        self.turns += 1
+        return [], False, None
+
+
+def _state():
+    return SimpleNamespace(phase=None, turn=None)
+
+
+def test_identical_consecutive_decisions_end_the_loop(monkeypatch):
+    monkeypatch.setattr(engine, "STALL_TURN_LIMIT", 2)
+    adapter = RepeatingAdapter()
+    engine.run(state=_state(), adapter=adapter)
+    # turn 0 sets the baseline, turns 1 and 2 repeat it
+    assert adapter.turns == 3
+
+
+def test_reworded_reasons_with_same_decisions_still_stall(monkeypatch):
+    monkeypatch.setattr(engine, "STALL_TURN_LIMIT", 2)
+    adapter = RepeatingAdapter(reworded=True)
+    engine.run(state=_state(), adapter=adapter)
+    assert adapter.turns == 3
+
+
+def test_changed_decision_resets_the_stall_count(monkeypatch):
+    monkeypatch.setattr(engine, "STALL_TURN_LIMIT", 2)
+    adapter = RepeatingAdapter(["denied", "denied", "pending_info", "pending_info", "pending_info"])
+    engine.run(state=_state(), adapter=adapter)
+    assert adapter.turns == 5
+
+
+def test_stall_detection_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(engine, "STALL_TURN_LIMIT", 0)
+    adapter = RepeatingAdapter()
+    engine.run(state=_state(), adapter=adapter)
+    assert adapter.turns == engine.MAX_TURNS_SAFETY_LIMIT